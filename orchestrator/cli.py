@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -9,7 +10,7 @@ import sys
 import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, NoReturn, TextIO
 
 from .cli_helpers import (
     extract_pr_number,
@@ -242,8 +243,51 @@ def add_manager_common_args(command_parser: argparse.ArgumentParser) -> None:
     )
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="AgentPR orchestrator CLI")
+class _CliArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that writes usage, help and errors to explicit streams.
+
+    argparse always targets ``sys.stdout``/``sys.stderr``; the Telegram bot runs
+    some commands in-process and must capture their output without swapping the
+    process-wide streams under other threads.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        stdout: TextIO | None = None,
+        stderr: TextIO | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def print_usage(self, file: TextIO | None = None) -> None:
+        super().print_usage(file or self.stdout)
+
+    def print_help(self, file: TextIO | None = None) -> None:
+        super().print_help(file or self.stdout)
+
+    def exit(self, status: int = 0, message: str | None = None) -> NoReturn:
+        if message:
+            (self.stderr or sys.stderr).write(message)
+        raise SystemExit(status)
+
+    def error(self, message: str) -> NoReturn:
+        self.print_usage(self.stderr or sys.stderr)
+        self.exit(2, f"{self.prog}: error: {message}\n")
+
+
+def build_parser(
+    *,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> argparse.ArgumentParser:
+    parser = _CliArgumentParser(
+        description="AgentPR orchestrator CLI",
+        stdout=stdout,
+        stderr=stderr,
+    )
     parser.add_argument(
         "--db",
         type=Path,
@@ -274,7 +318,11 @@ def build_parser() -> argparse.ArgumentParser:
         help="Skip automatic startup doctor gate for mutable commands.",
     )
 
-    sub = parser.add_subparsers(dest="command", required=True)
+    sub = parser.add_subparsers(
+        dest="command",
+        required=True,
+        parser_class=functools.partial(_CliArgumentParser, stdout=stdout, stderr=stderr),
+    )
 
     sub.add_parser("init-db", help="Initialize sqlite schema")
 
@@ -690,7 +738,10 @@ def build_parser() -> argparse.ArgumentParser:
     tb.add_argument(
         "--idle-sleep-sec",
         type=int,
-        help="Sleep when no updates. If omitted, uses manager policy default.",
+        help=(
+            "Base delay for poll-error backoff and webhook-mode ticks. "
+            "If omitted, uses manager policy default."
+        ),
     )
     tb.add_argument(
         "--list-limit",
@@ -1229,16 +1280,22 @@ def enforce_startup_doctor_gate(args: argparse.Namespace) -> None:
     )
 
 
-def main() -> int:
-    parser = build_parser()
-    args = parser.parse_args()
+def main(
+    argv: list[str] | None = None,
+    *,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int:
+    # stdout/stderr default to the process streams at write time.
+    parser = build_parser(stdout=stdout, stderr=stderr)
+    args = parser.parse_args(argv)
 
     try:
         service = build_service(args)
         executor = ScriptExecutor(args.integration_root)
 
         if args.command == "init-db":
-            print_json({"ok": True, "db": str(args.db)})
+            print_json({"ok": True, "db": str(args.db)}, file=stdout)
             return 0
 
         if args.command == "doctor":
@@ -1250,7 +1307,7 @@ def main() -> int:
                 require_telegram_token=args.require_telegram_token,
                 require_webhook_secret=args.require_webhook_secret,
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0 if report["ok"] else 1
 
         if args.command == "skills-status":
@@ -1289,7 +1346,8 @@ def main() -> int:
                         name for name in optional_curated if name in installed
                     ],
                     "missing_optional_ci": missing_optional,
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -1331,7 +1389,8 @@ def main() -> int:
                         name for name in OPTIONAL_CURATED_CI_SKILLS if name not in installed
                     ],
                     "note": "Restart codex-managed sessions if skill discovery is cached.",
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -1341,7 +1400,7 @@ def main() -> int:
                 run_id=args.run_id,
                 limit=max(int(args.limit), 1),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0
 
         if args.command == "skills-feedback":
@@ -1358,7 +1417,7 @@ def main() -> int:
             md_path = write_skills_feedback_markdown(feedback)
             feedback["report_path"] = str(json_path)
             feedback["markdown_path"] = str(md_path)
-            print_json(feedback)
+            print_json(feedback, file=stdout)
             return 0
 
         if args.command == "inspect-run":
@@ -1370,7 +1429,7 @@ def main() -> int:
                 command_limit=max(int(args.command_limit), 1),
                 include_log_tails=bool(args.include_log_tails),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0
 
         if args.command == "analyze-worker-output":
@@ -1378,7 +1437,7 @@ def main() -> int:
                 service=service,
                 run_id=str(args.run_id).strip(),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0 if bool(report.get("ok", False)) else 1
 
         if args.command == "get-global-stats":
@@ -1386,7 +1445,7 @@ def main() -> int:
                 service=service,
                 limit=max(int(args.limit), 1),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0
 
         if args.command == "notify-user":
@@ -1397,7 +1456,7 @@ def main() -> int:
                 priority=str(args.priority),
                 channel=str(args.channel),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0
 
         if args.command == "simulate-bot-session":
@@ -1494,7 +1553,8 @@ def main() -> int:
                     },
                     "last_run_id": str(conversation_state.get("last_run_id") or ""),
                     "transcript": transcript,
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -1504,7 +1564,7 @@ def main() -> int:
                 limit=max(int(args.limit), 1),
                 attempt_limit_per_run=max(int(args.attempt_limit_per_run), 1),
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0
 
         enforce_startup_doctor_gate(args)
@@ -1513,7 +1573,7 @@ def main() -> int:
             config = build_manager_loop_config_from_args(args)
             runner = ManagerLoopRunner(service=service, config=config)
             report = runner.tick()
-            print_json(report)
+            print_json(report, file=stdout)
             return 0 if report["ok"] else 1
 
         if args.command == "run-manager-loop":
@@ -1524,7 +1584,7 @@ def main() -> int:
             try:
                 while True:
                     report = runner.tick()
-                    print_json(report)
+                    print_json(report, file=stdout)
                     if not bool(report.get("ok", False)):
                         fail_count += 1
                     loops += 1
@@ -1547,15 +1607,15 @@ def main() -> int:
                     run_id=args.run_id,
                 )
             )
-            print_json({"run_id": run_id})
+            print_json({"run_id": run_id}, file=stdout)
             return 0
 
         if args.command == "list-runs":
-            print_json({"runs": service.list_runs(limit=args.limit)})
+            print_json({"runs": service.list_runs(limit=args.limit)}, file=stdout)
             return 0
 
         if args.command == "show-run":
-            print_json(service.get_run_snapshot(args.run_id))
+            print_json(service.get_run_snapshot(args.run_id), file=stdout)
             return 0
 
         if args.command == "start-discovery":
@@ -1563,7 +1623,8 @@ def main() -> int:
                 service.start_discovery(
                     args.run_id,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -1598,7 +1659,8 @@ def main() -> int:
                         "ok": False,
                         "exit_code": result.exit_code,
                         "stderr": result.stderr.strip(),
-                    }
+                    },
+                    file=stdout,
                 )
                 return result.exit_code
             print_json(
@@ -1606,7 +1668,8 @@ def main() -> int:
                     "ok": True,
                     "exit_code": result.exit_code,
                     "stdout_tail": tail(result.stdout),
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -1616,7 +1679,8 @@ def main() -> int:
                     args.run_id,
                     args.contract_path,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -1625,7 +1689,8 @@ def main() -> int:
                 service.start_implementation(
                     args.run_id,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -1634,7 +1699,8 @@ def main() -> int:
                 service.mark_local_validation_passed(
                     args.run_id,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -1651,7 +1717,7 @@ def main() -> int:
                 network_timeout_sec=args.network_timeout_sec,
                 codex_sandbox=args.codex_sandbox,
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0 if report["ok"] else 1
 
         if args.command == "run-agent-step":
@@ -1779,7 +1845,8 @@ def main() -> int:
                             "error": "workspace has pre-existing local changes",
                             "state": state_result["state"],
                             "diff": compact_diff,
-                        }
+                        },
+                        file=stdout,
                     )
                     return 1
             if not args.skip_preflight:
@@ -1809,7 +1876,8 @@ def main() -> int:
                             "error": "preflight failed",
                             "state": state_result["state"],
                             "preflight": preflight_report,
-                        }
+                        },
+                        file=stdout,
                     )
                     return 1
             runtime_policy = executor.runtime_policy_summary(repo_dir)
@@ -1862,7 +1930,8 @@ def main() -> int:
                             "skills_root": str(plan.skills_root),
                             "state": state_result["state"],
                             "next_command": install_cmd,
-                        }
+                        },
+                        file=stdout,
                     )
                     return 1
 
@@ -2122,7 +2191,8 @@ def main() -> int:
                         "agent_last_message": str(last_message_path) if last_message_path else None,
                         "run_digest": analysis_paths["run_digest"],
                         "manager_insight": analysis_paths["manager_insight"],
-                    }
+                    },
+                    file=stdout,
                 )
                 return result.exit_code
             if verdict["grade"] != AgentRuntimeGrade.PASS.value:
@@ -2166,7 +2236,8 @@ def main() -> int:
                         "agent_last_message": str(last_message_path) if last_message_path else None,
                         "run_digest": analysis_paths["run_digest"],
                         "manager_insight": analysis_paths["manager_insight"],
-                    }
+                    },
+                    file=stdout,
                 )
                 return 1
             success_state = converge_agent_success_state(
@@ -2197,7 +2268,8 @@ def main() -> int:
                     "agent_last_message": str(last_message_path) if last_message_path else None,
                     "run_digest": analysis_paths["run_digest"],
                     "manager_insight": analysis_paths["manager_insight"],
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -2231,7 +2303,8 @@ def main() -> int:
                         "ok": False,
                         "exit_code": result.exit_code,
                         "stderr": result.stderr.strip(),
-                    }
+                    },
+                    file=stdout,
                 )
                 return result.exit_code
 
@@ -2244,7 +2317,8 @@ def main() -> int:
                     "branch": branch,
                     "state": state_result["state"],
                     "stdout_tail": tail(result.stdout),
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -2335,7 +2409,8 @@ def main() -> int:
                         f"--request-file {request_path} "
                         f"--confirm-token {confirm_token} --confirm"
                     ),
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -2374,7 +2449,8 @@ def main() -> int:
                         "already_linked": True,
                         "state": current_state.value,
                         "pr_number": run["pr_number"],
-                    }
+                    },
+                    file=stdout,
                 )
                 return 0
 
@@ -2461,7 +2537,8 @@ def main() -> int:
                         "stderr": result.stderr.strip(),
                         "stdout_tail": tail(result.stdout),
                         "pr_url": pr_url,
-                    }
+                    },
+                    file=stdout,
                 )
                 return result.exit_code or 1
 
@@ -2479,7 +2556,8 @@ def main() -> int:
                         "pr_url": pr_url,
                         "stdout_tail": tail(result.stdout),
                         "stderr_tail": tail(result.stderr),
-                    }
+                    },
+                    file=stdout,
                 )
                 return 1
 
@@ -2503,7 +2581,8 @@ def main() -> int:
                         "bypassed": bool(args.allow_dod_bypass) and not bool(gate.get("ok", False)),
                         "snapshot": gate.get("snapshot"),
                     },
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -2519,7 +2598,7 @@ def main() -> int:
                             limit=args.limit,
                             dry_run=args.dry_run,
                         )
-                        print_json(payload)
+                        print_json(payload, file=stdout)
                         loops += 1
                         if args.max_loops is not None and loops >= args.max_loops:
                             break
@@ -2535,7 +2614,7 @@ def main() -> int:
                 limit=args.limit,
                 dry_run=args.dry_run,
             )
-            print_json(payload)
+            print_json(payload, file=stdout)
             return 0
 
         if args.command == "run-telegram-bot":
@@ -2663,7 +2742,8 @@ def main() -> int:
                     "source": args.source,
                     "keep_days": max(args.keep_days, 1),
                     "deleted": deleted,
-                }
+                },
+                file=stdout,
             )
             return 0
 
@@ -2682,7 +2762,7 @@ def main() -> int:
                 fail_on_retryable_failures=args.fail_on_retryable_failures,
                 fail_on_http5xx_rate=args.fail_on_http5xx_rate,
             )
-            print_json(report)
+            print_json(report, file=stdout)
             return 0 if report["ok"] else 1
 
         if args.command == "link-pr":
@@ -2691,7 +2771,8 @@ def main() -> int:
                     args.run_id,
                     pr_number=args.pr_number,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2700,7 +2781,8 @@ def main() -> int:
                 service.mark_done(
                     args.run_id,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2711,7 +2793,8 @@ def main() -> int:
                     conclusion=args.conclusion,
                     pr_number=args.pr_number,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2721,7 +2804,8 @@ def main() -> int:
                     args.run_id,
                     review_state=args.state,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2730,7 +2814,8 @@ def main() -> int:
                 service.pause_run(
                     args.run_id,
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2740,7 +2825,8 @@ def main() -> int:
                     args.run_id,
                     target_state=RunState(args.target_state),
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
@@ -2750,17 +2836,18 @@ def main() -> int:
                     args.run_id,
                     target_state=RunState(args.target_state),
                     idempotency_key=args.idempotency_key,
-                )
+                ),
+                file=stdout,
             )
             return 0
 
         parser.error(f"Unsupported command: {args.command}")
         return 2
     except json.JSONDecodeError as exc:
-        print_json({"ok": False, "error": f"invalid JSON: {exc}"})
+        print_json({"ok": False, "error": f"invalid JSON: {exc}"}, file=stdout)
         return 2
     except (RunNotFoundError, InvalidTransitionError, ValueError, KeyError) as exc:
-        print_json({"ok": False, "error": str(exc)})
+        print_json({"ok": False, "error": str(exc)}, file=stdout)
         return 1
 
 
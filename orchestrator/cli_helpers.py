@@ -7,7 +7,7 @@ import json
 import re
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from . import runtime_analysis as rt
 from .models import RunState
@@ -17,8 +17,8 @@ from .models import RunState
 # ---------------------------------------------------------------------------
 
 
-def print_json(payload: dict[str, Any]) -> None:
-    print(json.dumps(payload, ensure_ascii=True, sort_keys=True, indent=2))
+def print_json(payload: dict[str, Any], *, file: TextIO | None = None) -> None:
+    print(json.dumps(payload, ensure_ascii=True, sort_keys=True, indent=2), file=file)
 
 
 def tail(text: str, lines: int = 20) -> str:
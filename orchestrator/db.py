@@ -5,7 +5,7 @@ import sqlite3
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator
 
 from .models import RunMode, RunState
 
@@ -105,6 +105,15 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_attempts_run_step
                 ON step_attempts(run_id, step, attempt_no);
 
+                CREATE INDEX IF NOT EXISTS idx_artifacts_run_type
+                ON artifacts(run_id, artifact_type, id);
+
+                CREATE INDEX IF NOT EXISTS idx_run_states_updated
+                ON run_states(updated_at);
+
+                CREATE INDEX IF NOT EXISTS idx_run_states_state_updated
+                ON run_states(current_state, updated_at);
+
                 CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_received
                 ON webhook_deliveries(source, received_at);
                 """
@@ -198,9 +207,23 @@ class Database:
         result["budget"] = json.loads(result.pop("budget_json"))
         return result
 
-    def list_runs(self, conn: sqlite3.Connection, limit: int = 50) -> list[dict[str, Any]]:
+    def list_runs(
+        self,
+        conn: sqlite3.Connection,
+        limit: int = 50,
+        *,
+        states: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        where = ""
+        params: list[Any] = []
+        if states is not None:
+            state_values = sorted(set(states))
+            if not state_values:
+                return []
+            where = f"WHERE s.current_state IN ({','.join('?' * len(state_values))})"
+            params.extend(state_values)
         rows = conn.execute(
-            """
+            f"""
             SELECT
                 r.run_id,
                 r.owner,
@@ -214,13 +237,26 @@ class Database:
                 s.updated_at
             FROM runs r
             JOIN run_states s ON s.run_id = r.run_id
+            {where}
             ORDER BY s.updated_at DESC
             LIMIT ?
             """,
-            (limit,),
+            (*params, limit),
         ).fetchall()
         return [dict(row) for row in rows]
 
+    def get_change_watermark(self, conn: sqlite3.Connection) -> tuple[Any, ...]:
+        """Cheap fingerprint that moves whenever a run state, event or artifact is written."""
+        row = conn.execute(
+            """
+            SELECT
+                (SELECT MAX(updated_at) FROM run_states),
+                (SELECT MAX(event_id) FROM events),
+                (SELECT MAX(id) FROM artifacts)
+            """
+        ).fetchone()
+        return tuple(row)
+
     def get_state(self, conn: sqlite3.Connection, run_id: str) -> RunState:
         row = conn.execute(
             "SELECT current_state FROM run_states WHERE run_id = ?", (run_id,)
@@ -495,6 +531,139 @@ class Database:
             result.append(item)
         return result
 
+    def list_artifacts_for_runs(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        run_ids: list[str],
+        artifact_type: str,
+    ) -> list[dict[str, Any]]:
+        """All ``artifact_type`` artifacts of ``run_ids``, newest first, in few queries."""
+        result: list[dict[str, Any]] = []
+        unique_ids = list(dict.fromkeys(run_ids))
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(unique_ids), 500):
+            chunk = unique_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""
+                SELECT id, run_id, artifact_type, uri, metadata_json, created_at
+                FROM artifacts
+                WHERE artifact_type = ? AND run_id IN ({placeholders})
+                ORDER BY id DESC
+                """,
+                (artifact_type, *chunk),
+            ).fetchall()
+            for row in rows:
+                item = dict(row)
+                item["metadata"] = json.loads(item.pop("metadata_json"))
+                result.append(item)
+        return result
+
+    def list_runs_with_latest_artifact(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        state: str,
+        artifact_type: str,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Runs in ``state`` joined to their newest ``artifact_type`` artifact, in one query."""
+        rows = conn.execute(
+            """
+            SELECT
+                r.run_id,
+                r.owner,
+                r.repo,
+                s.current_state,
+                s.updated_at,
+                a.id AS artifact_id,
+                a.uri,
+                a.metadata_json
+            FROM runs r
+            JOIN run_states s ON s.run_id = r.run_id
+            JOIN artifacts a ON a.id = (
+                SELECT MAX(id)
+                FROM artifacts
+                WHERE run_id = r.run_id AND artifact_type = ?
+            )
+            WHERE s.current_state = ?
+            ORDER BY s.updated_at DESC
+            LIMIT ?
+            """,
+            (artifact_type, state, limit),
+        ).fetchall()
+        result: list[dict[str, Any]] = []
+        for row in rows:
+            item = dict(row)
+            item["metadata"] = json.loads(item.pop("metadata_json"))
+            result.append(item)
+        return result
+
+    def list_runs_with_optional_artifact(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        artifact_type: str,
+        artifact_state: str | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Latest runs (as ``list_runs``), each with its newest ``artifact_type`` artifact.
+
+        With ``artifact_state`` set, only runs currently in that state get the
+        artifact looked up; the ``artifact`` key is ``None`` for the others and
+        for runs without one.
+        """
+        rows = conn.execute(
+            """
+            SELECT
+                r.run_id,
+                r.owner,
+                r.repo,
+                r.mode,
+                r.state_schema_version,
+                r.prompt_version,
+                r.pr_number,
+                s.current_state,
+                s.last_error,
+                s.updated_at,
+                a.id AS artifact_id,
+                a.artifact_type AS artifact_type,
+                a.uri AS artifact_uri,
+                a.metadata_json AS artifact_metadata_json,
+                a.created_at AS artifact_created_at
+            FROM runs r
+            JOIN run_states s ON s.run_id = r.run_id
+            LEFT JOIN artifacts a ON (? IS NULL OR s.current_state = ?) AND a.id = (
+                SELECT MAX(id)
+                FROM artifacts
+                WHERE run_id = r.run_id AND artifact_type = ?
+            )
+            ORDER BY s.updated_at DESC
+            LIMIT ?
+            """,
+            (artifact_state, artifact_state, artifact_type, limit),
+        ).fetchall()
+        result: list[dict[str, Any]] = []
+        for row in rows:
+            item = dict(row)
+            artifact_id = item.pop("artifact_id")
+            artifact = {
+                "id": artifact_id,
+                "run_id": item["run_id"],
+                "artifact_type": item.pop("artifact_type"),
+                "uri": item.pop("artifact_uri"),
+                "metadata_json": item.pop("artifact_metadata_json"),
+                "created_at": item.pop("artifact_created_at"),
+            }
+            if artifact_id is None:
+                item["artifact"] = None
+            else:
+                artifact["metadata"] = json.loads(artifact.pop("metadata_json"))
+                item["artifact"] = artifact
+            result.append(item)
+        return result
+
     def list_artifacts_global(
         self,
         conn: sqlite3.Connection,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from collections import Counter
 from typing import Any
 
@@ -119,7 +120,11 @@ def get_global_stats(
     service: OrchestratorService,
     limit: int = 200,
 ) -> dict[str, Any]:
-    rows = service.list_runs(limit=max(int(limit), 1))
+    # Grade and reason code are recorded on the run_digest artifact, so most
+    # runs are counted from this one query; only runs without that metadata
+    # (legacy agent_runtime reports) fall back to reading the report file. As
+    # with analyze_worker_output, a digest whose file is gone is not counted.
+    rows = service.list_runs_with_latest_digest(limit=max(int(limit), 1))
     state_counter: Counter[str] = Counter()
     grade_counter: Counter[str] = Counter()
     reason_counter: Counter[str] = Counter()
@@ -129,6 +134,14 @@ def get_global_stats(
         run_id = str(row.get("run_id") or "").strip()
         if not run_id:
             continue
+        digest = row.get("run_digest")
+        metadata = digest.get("metadata") if isinstance(digest, dict) else None
+        uri = str(digest.get("uri") or "").strip() if isinstance(digest, dict) else ""
+        if isinstance(metadata, dict) and metadata.get("grade") and os.access(uri, os.R_OK):
+            digest_available += 1
+            grade_counter[str(metadata["grade"])] += 1
+            reason_counter[str(metadata.get("reason_code") or "unknown")] += 1
+            continue
         analyzed = analyze_worker_output(service=service, run_id=run_id)
         if not analyzed.get("ok"):
             continue
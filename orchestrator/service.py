@@ -5,7 +5,7 @@ import json
 import sqlite3
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from .db import Database
 from .models import (
@@ -263,9 +263,14 @@ class OrchestratorService:
         )
         return self._apply_event(event)
 
-    def list_runs(self, limit: int = 50) -> list[dict[str, Any]]:
+    def list_runs(
+        self,
+        limit: int = 50,
+        *,
+        states: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
         with self.db.transaction() as conn:
-            rows = self.db.list_runs(conn, limit=limit)
+            rows = self.db.list_runs(conn, limit=limit, states=states)
         out: list[dict[str, Any]] = []
         for row in rows:
             item = dict(row)
@@ -273,6 +278,10 @@ class OrchestratorService:
             out.append(item)
         return out
 
+    def get_change_watermark(self) -> tuple[Any, ...]:
+        with self.db.transaction() as conn:
+            return self.db.get_change_watermark(conn)
+
     def get_run_snapshot(self, run_id: str) -> dict[str, Any]:
         snapshot = self.db.get_run_snapshot(run_id)
         snapshot["display_state"] = snapshot["state"]
@@ -438,6 +447,57 @@ class OrchestratorService:
                 metadata=metadata,
             )
 
+    def list_pending_pr_requests(self, *, limit: int = 50) -> list[dict[str, Any]]:
+        with self.db.transaction() as conn:
+            return self.db.list_runs_with_latest_artifact(
+                conn,
+                state=RunState.PUSHED.value,
+                artifact_type="pr_open_request",
+                limit=limit,
+            )
+
+    def list_runs_with_pending_pr(self, limit: int = 50) -> list[dict[str, Any]]:
+        """``list_runs`` rows plus ``pr_open_request``: the newest request of PUSHED runs, else None."""
+        with self.db.transaction() as conn:
+            rows = self.db.list_runs_with_optional_artifact(
+                conn,
+                artifact_type="pr_open_request",
+                artifact_state=RunState.PUSHED.value,
+                limit=limit,
+            )
+        for item in rows:
+            item["display_state"] = str(item.get("current_state") or RunState.QUEUED.value)
+            item["pr_open_request"] = item.pop("artifact")
+        return rows
+
+    def list_runs_with_latest_digest(self, limit: int = 50) -> list[dict[str, Any]]:
+        """``list_runs`` rows plus ``run_digest``: each run's newest run_digest artifact or None."""
+        with self.db.transaction() as conn:
+            rows = self.db.list_runs_with_optional_artifact(
+                conn,
+                artifact_type="run_digest",
+                limit=limit,
+            )
+        for item in rows:
+            item["display_state"] = str(item.get("current_state") or RunState.QUEUED.value)
+            item["run_digest"] = item.pop("artifact")
+        return rows
+
+    def list_artifacts_for_runs(
+        self,
+        run_ids: list[str],
+        *,
+        artifact_type: str,
+    ) -> list[dict[str, Any]]:
+        if not run_ids:
+            return []
+        with self.db.transaction() as conn:
+            return self.db.list_artifacts_for_runs(
+                conn,
+                run_ids=run_ids,
+                artifact_type=artifact_type,
+            )
+
     def list_artifacts_global(
         self,
         *,
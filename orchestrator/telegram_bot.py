@@ -1,36 +1,52 @@
 from __future__ import annotations
 
+import atexit
+import base64
+import functools
+import hmac
+import http.client
 import json
-import shlex
+import os
+import queue
+import random
+import ssl
+import sys
+import threading
 import time
-import urllib.error
+import urllib.parse
 import urllib.request
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from .manager_llm import BotLLMSelection, ManagerLLMClient, ManagerLLMError
+from .manager_tools import get_global_stats
 from .models import RunState
 from .service import OrchestratorService
 from .telegram_bot_helpers import (
+    BOT_NL_ALLOWED_ACTION_SET,
     BOT_NL_ALLOWED_ACTIONS,
     DECISION_WHY_MODE_HYBRID,
     DECISION_WHY_MODE_OFF,
     DECISION_WHY_MODES,
     DEFAULT_TARGET_STATE,
+    NL_DISPATCH_COMMAND,
     NL_MODE_HYBRID,
     NL_MODE_LLM,
     NL_MODE_RULES,
     NL_MODES,
-    NOTIFY_TERMINAL_STATES,
+    NOTIFY_SCAN_STATES,
+    TELEGRAM_MODE_WEBHOOK,
     REASON_CODE_EXPLANATIONS,
     authorize_command,
     build_audit_entry,
     build_decision_llm_client_if_enabled,
     build_nl_llm_client_if_enabled,
     clamp_str,
-    contains_any,
     extract_prompt_version_from_text,
     extract_repo_ref_text,
     extract_repo_refs_text,
@@ -38,6 +54,7 @@ from .telegram_bot_helpers import (
     extract_target_state_from_text,
     format_bot_response,
     get_last_run_id,
+    match_nl_intents,
     normalize_target_state,
     parse_bool_env,
     parse_command_name,
@@ -47,32 +64,110 @@ from .telegram_bot_helpers import (
     resolve_decision_why_mode,
     resolve_default_prompt_version,
     resolve_notification_chat_ids,
+    resolve_target_state,
+    resolve_telegram_mode,
     resolve_telegram_nl_mode,
     run_and_render_action,
     run_cli_command,
     safe_send_message,
     set_last_run_id,
+    split_command_text,
     sync_last_run_id_from_text,
+    truncate_text,
 )
 
 
+TELEGRAM_MAX_MESSAGE_CHARS = 4096
+# The loop only reads these update types; Telegram filters the rest server-side.
+TELEGRAM_ALLOWED_UPDATES = ["message", "edited_message"]
+TELEGRAM_WEBHOOK_MAX_BODY_BYTES = 1_000_000
+TELEGRAM_WEBHOOK_REQUEST_TIMEOUT_SEC = 10
+# Characters format_bot_response adds to a reply body (separator and rules footer).
+_REPLY_FOOTER_CHARS = len(format_bot_response("x")) - 1
+# Pastes at least this long are likely the first part of a client-side split.
+TELEGRAM_SPLIT_THRESHOLD_CHARS = 4000
+LONG_MESSAGE_HOLD_SEC = 2.0
+RATE_LIMIT_SWEEP_EVERY_CALLS = 1000
+MAX_CONVERSATION_STATES = 10_000
+POLL_ERROR_MAX_BACKOFF_SEC = 60
+# Re-poll delay while getUpdates only returns updates whose jobs are still running.
+UNACKED_UPDATE_REPOLL_SEC = 1.0
+# Overview renders are keyed by the DB change watermark; the TTL bounds staleness
+# of digest files that can change without a new DB row.
+OVERVIEW_CACHE_TTL_SEC = 5.0
+OVERVIEW_CACHE_MAX_ENTRIES = 16
+_OVERVIEW_CACHE: OrderedDict[tuple[Any, ...], tuple[float, str]] = OrderedDict()
+_OVERVIEW_CACHE_LOCK = threading.Lock()
+# Renders in progress, so concurrent /overview requests share one DB walk.
+_OVERVIEW_INFLIGHT: dict[tuple[Any, ...], Future[str]] = {}
+# Decision-card explanations are keyed by the exact card sent to the LLM, so a
+# repeated /show of an unchanged run skips the provider round trip.
+DECISION_EXPLAIN_CACHE_MAX_ENTRIES = 256
+_DECISION_EXPLAIN_CACHE: OrderedDict[tuple[Any, ...], tuple[str, tuple[str, ...]]] = OrderedDict()
+_DECISION_EXPLAIN_CACHE_LOCK = threading.Lock()
+
+
 class TelegramApiError(RuntimeError):
     pass
 
 
 class TelegramClient:
-    def __init__(self, token: str) -> None:
-        self.base_url = f"https://api.telegram.org/bot{token}"
+    """Bot API client that reuses keep-alive HTTPS connections across calls.
+
+    Idle connections sit in a small LIFO pool shared by the polling, reply and
+    notification threads. A request that fails on a reused connection because
+    the server dropped it is retried once on a fresh connection.
+    """
+
+    host = "api.telegram.org"
 
-    def get_updates(self, *, offset: int | None, timeout_sec: int) -> list[dict[str, Any]]:
-        payload: dict[str, Any] = {"timeout": timeout_sec}
+    def __init__(
+        self,
+        token: str,
+        *,
+        timeout_sec: float = 45.0,
+        max_idle_connections: int = 4,
+    ) -> None:
+        self.base_url = f"https://{self.host}/bot{token}"
+        self._path_prefix = f"/bot{token}"
+        self.timeout_sec = float(timeout_sec)
+        self.max_idle_connections = max(int(max_idle_connections), 1)
+        self._ssl_context = ssl.create_default_context()
+        self._idle: list[http.client.HTTPSConnection] = []
+        self._pool_lock = threading.Lock()
+
+    def get_updates(
+        self,
+        *,
+        offset: int | None,
+        timeout_sec: int,
+        allowed_updates: list[str] | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        payload: dict[str, Any] = {"timeout": timeout_sec, "limit": limit}
         if offset is not None:
             payload["offset"] = offset
-        data = self._call("getUpdates", payload)
+        if allowed_updates is not None:
+            payload["allowed_updates"] = allowed_updates
+        # The server holds the request for up to timeout_sec; leave headroom on our side.
+        data = self._call("getUpdates", payload, timeout_sec=timeout_sec + 10)
         if not isinstance(data, list):
             return []
         return [item for item in data if isinstance(item, dict)]
 
+    def set_webhook(self, *, url: str, secret_token: str, allowed_updates: list[str]) -> None:
+        self._call(
+            "setWebhook",
+            {
+                "url": url,
+                "secret_token": secret_token,
+                "allowed_updates": allowed_updates,
+            },
+        )
+
+    def delete_webhook(self) -> None:
+        self._call("deleteWebhook", {"drop_pending_updates": False})
+
     def send_message(self, *, chat_id: int, text: str) -> None:
         self._call(
             "sendMessage",
@@ -83,80 +178,542 @@ class TelegramClient:
             },
         )
 
-    def _call(self, method: str, payload: dict[str, Any]) -> Any:
-        url = f"{self.base_url}/{method}"
-        request = urllib.request.Request(
-            url=url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        try:
-            with urllib.request.urlopen(request, timeout=45) as response:
-                body = response.read().decode("utf-8")
-        except urllib.error.URLError as exc:
-            raise TelegramApiError(f"Telegram API request failed: {exc}") from exc
+    def close(self) -> None:
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _call(
+        self,
+        method: str,
+        payload: dict[str, Any],
+        *,
+        timeout_sec: float | None = None,
+    ) -> Any:
+        data = json.dumps(payload, separators=(",", ":")).encode("ascii")
+        headers = {"Content-Type": "application/json"}
+        path = f"{self._path_prefix}/{method}"
+        timeout = max(self.timeout_sec, float(timeout_sec or 0))
+        for attempt in range(2):
+            conn, reused = self._acquire_connection()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("POST", path, body=data, headers=headers)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as exc:
+                conn.close()
+                # The request was never fully sent, so a stale pooled connection is
+                # safe to retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise TelegramApiError(f"Telegram API request failed: {exc}") from exc
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                raise TelegramApiError(f"Telegram API request failed: {exc}") from exc
+            try:
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                # Telegram may already have handled the request (sendMessage is not
+                # idempotent), so a failure after sending is never retried.
+                conn.close()
+                raise TelegramApiError(f"Telegram API request failed: {exc}") from exc
+            if response.will_close:
+                conn.close()
+            else:
+                self._release_connection(conn)
+            break
         try:
             payload_json = json.loads(body)
-        except json.JSONDecodeError as exc:
-            raise TelegramApiError(f"Invalid Telegram API response: {body[:200]}") from exc
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            preview = body[:200].decode("utf-8", errors="replace")
+            raise TelegramApiError(f"Invalid Telegram API response: {preview}") from exc
         if not payload_json.get("ok", False):
             raise TelegramApiError(f"Telegram API error: {payload_json}")
         return payload_json.get("result")
 
+    def _acquire_connection(self) -> tuple[http.client.HTTPSConnection, bool]:
+        with self._pool_lock:
+            if self._idle:
+                return self._idle.pop(), True
+        proxy = urllib.request.getproxies().get("https")
+        if proxy and not urllib.request.proxy_bypass(self.host):
+            parsed = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            conn = http.client.HTTPSConnection(
+                parsed.hostname or "",
+                # Like urllib, which also tunnels over HTTPSConnection (default 443).
+                parsed.port or 443,
+                timeout=self.timeout_sec,
+                context=self._ssl_context,
+            )
+            tunnel_headers: dict[str, str] = {}
+            if parsed.username is not None:
+                userinfo = (
+                    f"{urllib.parse.unquote(parsed.username)}:"
+                    f"{urllib.parse.unquote(parsed.password or '')}"
+                )
+                token = base64.b64encode(userinfo.encode("utf-8")).decode("ascii")
+                tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+            conn.set_tunnel(self.host, 443, headers=tunnel_headers)
+            return conn, False
+        return (
+            http.client.HTTPSConnection(
+                self.host,
+                timeout=self.timeout_sec,
+                context=self._ssl_context,
+            ),
+            False,
+        )
+
+    def _release_connection(self, conn: http.client.HTTPSConnection) -> None:
+        with self._pool_lock:
+            if len(self._idle) < self.max_idle_connections:
+                self._idle.append(conn)
+                return
+        conn.close()
+
 
 class CommandRateLimiter:
+    """Token-bucket limiter: ``limit`` commands per ``window_sec``, per chat and global.
+
+    Each bucket is just ``(tokens, last_refill_ts)``, so ``allow`` is O(1) and
+    never scans other chats. A bucket that has been idle for a whole window is
+    full again and carries no state worth keeping, so idle chats are swept off
+    the front of an LRU that is also capped at ``max_tracked_chats``.
+    """
+
     def __init__(
         self,
         *,
         window_sec: int,
         per_chat_limit: int,
         global_limit: int,
+        max_tracked_chats: int = 10_000,
     ) -> None:
         self.window_sec = max(int(window_sec), 1)
         self.per_chat_limit = max(int(per_chat_limit), 1)
         self.global_limit = max(int(global_limit), 1)
-        self._global: deque[float] = deque()
-        self._per_chat: dict[int, deque[float]] = {}
+        self.max_tracked_chats = max(int(max_tracked_chats), 1)
+        self._per_chat_rate = self.per_chat_limit / float(self.window_sec)
+        self._global_rate = self.global_limit / float(self.window_sec)
+        self._global_bucket: tuple[float, float] | None = None
+        self._per_chat: OrderedDict[int, tuple[float, float]] = OrderedDict()
+        self._calls_since_sweep = 0
 
     def allow(self, *, chat_id: int, now_ts: float) -> tuple[bool, str | None]:
-        self._evict(now_ts=now_ts)
-        if len(self._global) >= self.global_limit:
+        self._calls_since_sweep += 1
+        if self._calls_since_sweep >= RATE_LIMIT_SWEEP_EVERY_CALLS:
+            self._calls_since_sweep = 0
+            self._sweep_idle_chats(now_ts)
+        global_tokens = self._refill(
+            self._global_bucket, now_ts, self.global_limit, self._global_rate
+        )
+        if global_tokens < 1.0:
+            self._global_bucket = (global_tokens, now_ts)
             return False, "global_rate_limited"
-        chat_queue = self._per_chat.setdefault(chat_id, deque())
-        if len(chat_queue) >= self.per_chat_limit:
+        chat_tokens = self._refill(
+            self._per_chat.get(chat_id), now_ts, self.per_chat_limit, self._per_chat_rate
+        )
+        if chat_id in self._per_chat:
+            self._per_chat.move_to_end(chat_id)
+        if chat_tokens < 1.0:
+            self._per_chat[chat_id] = (chat_tokens, now_ts)
             return False, "chat_rate_limited"
-        self._global.append(now_ts)
-        chat_queue.append(now_ts)
+        self._global_bucket = (global_tokens - 1.0, now_ts)
+        self._per_chat[chat_id] = (chat_tokens - 1.0, now_ts)
+        if len(self._per_chat) > self.max_tracked_chats:
+            self._per_chat.popitem(last=False)
         return True, None
 
-    def _evict(self, *, now_ts: float) -> None:
-        cutoff = now_ts - float(self.window_sec)
-        while self._global and self._global[0] < cutoff:
-            self._global.popleft()
-        stale_chat_ids: list[int] = []
-        for chat_id, queue in self._per_chat.items():
-            while queue and queue[0] < cutoff:
-                queue.popleft()
-            if not queue:
-                stale_chat_ids.append(chat_id)
-        for chat_id in stale_chat_ids:
-            self._per_chat.pop(chat_id, None)
+    def _sweep_idle_chats(self, now_ts: float) -> None:
+        # LRU order means idle chats sit at the front; stop at the first active one.
+        idle_before = now_ts - self.window_sec
+        while self._per_chat:
+            chat_id, (_, last_ts) = next(iter(self._per_chat.items()))
+            if last_ts > idle_before:
+                return
+            del self._per_chat[chat_id]
+
+    @staticmethod
+    def _refill(
+        bucket: tuple[float, float] | None,
+        now_ts: float,
+        capacity: int,
+        rate: float,
+    ) -> float:
+        if bucket is None:
+            return float(capacity)
+        tokens, last_ts = bucket
+        return min(float(capacity), tokens + max(now_ts - last_ts, 0.0) * rate)
 
 
 class TelegramAuditLogger:
-    def __init__(self, path: Path | None) -> None:
+    """Append audit entries as JSON lines from a background writer thread.
+
+    ``append`` only enqueues; the writer keeps one file handle open, serializes
+    up to ``batch_size`` entries (or whatever arrives within ``flush_interval_sec``)
+    and writes them in a single call. ``close`` drains the queue. A float ``ts``
+    (epoch seconds) is rendered as an ISO-8601 UTC string by the writer, so hot
+    paths can stamp entries with ``time.time()``. Write failures are reported on
+    stderr and the batch is dropped; the writer keeps draining the queue.
+    """
+
+    def __init__(
+        self,
+        path: Path | None,
+        *,
+        batch_size: int = 64,
+        flush_interval_sec: float = 0.2,
+    ) -> None:
         self.path = path
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval_sec = max(float(flush_interval_sec), 0.0)
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
         if self.path is not None:
             self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self.path,),
+                name="agentpr-telegram-audit",
+                daemon=True,
+            )
+            self._thread.start()
+            # Drain queued entries even if the process exits without close().
+            atexit.register(self.close)
 
     def append(self, payload: dict[str, Any]) -> None:
-        if self.path is None:
+        if self._thread is None:
             return
-        line = json.dumps(payload, ensure_ascii=True, sort_keys=True)
-        with self.path.open("a", encoding="utf-8") as fh:
-            fh.write(line)
-            fh.write("\n")
+        self._queue.put(payload)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, path: Path) -> None:
+        try:
+            fh = path.open("a", buffering=1 << 16, encoding="utf-8")
+        except OSError as exc:
+            # Keep consuming so the queue cannot grow without bound.
+            print(f"agentpr audit log disabled: {type(exc).__name__}: {exc}", file=sys.stderr)
+            fh = None
+        try:
+            closing = False
+            while not closing:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval_sec
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+                if fh is not None:
+                    self._write_batch(fh, batch)
+        finally:
+            if fh is not None:
+                fh.close()
+
+    @staticmethod
+    def _write_batch(fh: Any, batch: list[dict[str, Any]]) -> None:
+        try:
+            for entry in batch:
+                ts = entry.get("ts")
+                if isinstance(ts, float):
+                    entry["ts"] = datetime.fromtimestamp(ts, UTC).isoformat()
+            fh.write(
+                "".join(
+                    json.dumps(entry, ensure_ascii=True, separators=(",", ":")) + "\n"
+                    for entry in batch
+                )
+            )
+            fh.flush()
+        except Exception as exc:  # noqa: BLE001
+            print(f"agentpr audit write failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+
+
+class UpdateAckTracker:
+    """Track polled updates so ``getUpdates`` only acknowledges finished work.
+
+    ``getUpdates(offset=N)`` confirms every update below ``N`` to Telegram, so the
+    offset only advances past a contiguous run of finished updates. If the bot dies
+    mid-batch, unfinished updates (including held long pastes) are delivered again.
+    Updates that come back while still in flight are reported as already seen.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._offset: int | None = None
+        # update_id -> finished, for every update at or above the offset.
+        self._open: dict[int, bool] = {}
+
+    @property
+    def offset(self) -> int | None:
+        with self._cond:
+            return self._offset
+
+    def begin(self, update_id: int) -> bool:
+        """Start tracking ``update_id``; False if it was already seen."""
+        with self._cond:
+            if self._offset is not None and update_id < self._offset:
+                return False
+            if update_id in self._open:
+                return False
+            self._open[update_id] = False
+            return True
+
+    def finish(self, *update_ids: int) -> None:
+        # Unknown ids (webhook mode never calls begin) are ignored.
+        with self._cond:
+            for update_id in update_ids:
+                if update_id in self._open:
+                    self._open[update_id] = True
+            for update_id in sorted(self._open):
+                if not self._open[update_id]:
+                    break
+                del self._open[update_id]
+                self._offset = update_id + 1
+            self._cond.notify_all()
+
+    def wait(self, timeout_sec: float) -> None:
+        """Block until some update finishes or ``timeout_sec`` passes."""
+        with self._cond:
+            self._cond.wait(timeout=timeout_sec)
+
+
+class ChatLaneDispatcher:
+    """Run update jobs on a bounded thread pool, keeping each chat's jobs in order.
+
+    Jobs for different chats overlap (Telegram I/O, CLI subprocesses, LLM calls),
+    so one slow command no longer stalls every other chat behind it. A job that
+    raises is recorded in the audit log and the lane moves on.
+    """
+
+    def __init__(self, *, max_workers: int, audit: TelegramAuditLogger | None = None) -> None:
+        self.audit = audit
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(int(max_workers), 1),
+            thread_name_prefix="agentpr-telegram",
+        )
+        self._lock = threading.Lock()
+        self._lanes: dict[int, deque[Callable[[], None]]] = {}
+
+    def submit(self, chat_id: int, job: Callable[[], None]) -> None:
+        with self._lock:
+            lane = self._lanes.get(chat_id)
+            if lane is not None:
+                lane.append(job)
+                return
+            self._lanes[chat_id] = deque()
+        self._pool.submit(self._drain, chat_id, job)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _drain(self, chat_id: int, job: Callable[[], None]) -> None:
+        while True:
+            try:
+                job()
+            except Exception as exc:  # noqa: BLE001
+                # Keep the lane alive; jobs normally reply with their own failures.
+                if self.audit is not None:
+                    self.audit.append(
+                        {
+                            "ts": time.time(),
+                            "kind": "job_error",
+                            "chat_id": chat_id,
+                            "error": f"{type(exc).__name__}: {exc}",
+                        }
+                    )
+            with self._lock:
+                lane = self._lanes[chat_id]
+                if not lane:
+                    del self._lanes[chat_id]
+                    return
+                job = lane.popleft()
+
+
+class TelegramOutbox:
+    """Queue reply bodies and send them from a small sender pool within Telegram's limits.
+
+    Bodies for the same chat that arrive within ``coalesce_window_sec`` are joined
+    and formatted (with the rules footer) once per ``sendMessage``, up to
+    ``TELEGRAM_MAX_MESSAGE_CHARS``. Sends are paced by a bot-wide token bucket and
+    a minimum per-chat interval, and run on ``max_senders`` threads with at most
+    one send in flight per chat, so a stalled send only holds up its own chat.
+    Each chat keeps at most ``max_pending_per_chat`` queued replies; on overflow
+    the oldest is dropped and recorded in the audit log.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: TelegramClient,
+        audit: TelegramAuditLogger | None = None,
+        global_per_sec: float = 30.0,
+        per_chat_interval_sec: float = 1.0,
+        coalesce_window_sec: float = 0.1,
+        max_pending_per_chat: int = 20,
+        max_senders: int = 4,
+    ) -> None:
+        self.client = client
+        self.audit = audit
+        self.global_per_sec = max(float(global_per_sec), 1.0)
+        self.per_chat_interval_sec = max(float(per_chat_interval_sec), 0.0)
+        self.coalesce_window_sec = max(float(coalesce_window_sec), 0.0)
+        self.max_pending_per_chat = max(int(max_pending_per_chat), 1)
+        self.max_senders = max(int(max_senders), 1)
+        self._cond = threading.Condition()
+        self._pending: dict[int, deque[tuple[float, str]]] = {}
+        self._next_send_at: dict[int, float] = {}
+        self._sending: set[int] = set()
+        self._closed = False
+        self._tokens = self.global_per_sec
+        self._tokens_at = time.monotonic()
+        self._senders = ThreadPoolExecutor(
+            max_workers=self.max_senders,
+            thread_name_prefix="agentpr-telegram-send",
+        )
+        self._thread = threading.Thread(
+            target=self._run,
+            name="agentpr-telegram-outbox",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def send(self, *, chat_id: int, text: str) -> None:
+        """Queue an unformatted reply body for ``chat_id``."""
+        dropped: str | None = None
+        with self._cond:
+            pending = self._pending.get(chat_id)
+            if pending is None:
+                pending = deque()
+                self._pending[chat_id] = pending
+            elif len(pending) >= self.max_pending_per_chat:
+                dropped = pending.popleft()[1]
+            pending.append((time.monotonic(), text))
+            self._cond.notify()
+        if dropped is not None:
+            self._audit_drop(chat_id, dropped, reason="max_pending_per_chat")
+
+    def close(self, *, timeout_sec: float = 10.0) -> None:
+        """Flush queued replies for up to ``timeout_sec``, then drop the rest.
+
+        Returns only after in-flight sends finish, so the client and the audit
+        logger can be closed right after.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout_sec)
+        if not self._thread.is_alive():
+            return
+        with self._cond:
+            dropped = [
+                (chat_id, body) for chat_id, pending in self._pending.items() for _, body in pending
+            ]
+            self._pending.clear()
+            self._cond.notify()
+        for chat_id, body in dropped:
+            self._audit_drop(chat_id, body, reason="shutdown")
+        # The flusher now exits and waits for the sender pool.
+        self._thread.join()
+
+    def _audit_drop(self, chat_id: int, text: str, *, reason: str) -> None:
+        if self.audit is None:
+            return
+        self.audit.append(
+            {
+                "ts": time.time(),
+                "kind": "outbox_drop",
+                "chat_id": chat_id,
+                "reason": reason,
+                "dropped_text": truncate_text(text, 400),
+            }
+        )
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while True:
+                        batch, wait_sec = self._take_ready(time.monotonic())
+                        if batch is not None:
+                            break
+                        if self._closed and not self._pending:
+                            return
+                        self._cond.wait(timeout=wait_sec)
+                self._acquire_global_token()
+                self._senders.submit(self._deliver, batch[0], batch[1])
+        finally:
+            self._senders.shutdown(wait=True)
+
+    def _deliver(self, chat_id: int, text: str) -> None:
+        try:
+            safe_send_message(client=self.client, chat_id=chat_id, text=text)
+        finally:
+            with self._cond:
+                self._sending.discard(chat_id)
+                self._cond.notify()
+
+    def _take_ready(self, now: float) -> tuple[tuple[int, str] | None, float | None]:
+        # Caller holds self._cond. With every sender busy, wait for a _deliver notify.
+        if len(self._sending) >= self.max_senders:
+            return None, None
+        wait_sec: float | None = None
+        for chat_id, pending in self._pending.items():
+            if chat_id in self._sending:
+                continue
+            ready_at = self._next_send_at.get(chat_id, 0.0)
+            if not self._closed:
+                ready_at = max(ready_at, pending[0][0] + self.coalesce_window_sec)
+            if ready_at > now:
+                delay = ready_at - now
+                wait_sec = delay if wait_sec is None else min(wait_sec, delay)
+                continue
+            body = pending.popleft()[1]
+            while (
+                pending
+                and len(body) + 2 + len(pending[0][1]) + _REPLY_FOOTER_CHARS
+                <= TELEGRAM_MAX_MESSAGE_CHARS
+            ):
+                body = f"{body}\n\n{pending.popleft()[1]}"
+            if not pending:
+                del self._pending[chat_id]
+            self._sending.add(chat_id)
+            self._next_send_at[chat_id] = now + self.per_chat_interval_sec
+            if len(self._next_send_at) > len(self._pending) + 1000:
+                self._next_send_at = {
+                    key: value for key, value in self._next_send_at.items() if value > now
+                }
+            return (chat_id, format_bot_response(body)), None
+        return None, wait_sec
+
+    def _acquire_global_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.global_per_sec,
+                self._tokens + (now - self._tokens_at) * self.global_per_sec,
+            )
+            self._tokens_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            time.sleep((1.0 - self._tokens) / self.global_per_sec)
 
 
 def run_telegram_bot_loop(
@@ -167,9 +724,9 @@ def run_telegram_bot_loop(
     workspace_root: Path,
     integration_root: Path,
     project_root: Path,
-    allowed_chat_ids: set[int],
-    write_chat_ids: set[int],
-    admin_chat_ids: set[int],
+    allowed_chat_ids: set[int] | frozenset[int],
+    write_chat_ids: set[int] | frozenset[int],
+    admin_chat_ids: set[int] | frozenset[int],
     poll_timeout_sec: int,
     idle_sleep_sec: int,
     list_limit: int,
@@ -178,14 +735,19 @@ def run_telegram_bot_loop(
     rate_limit_global: int,
     audit_log_file: Path | None,
 ) -> None:
-    offset: int | None = None
+    acks = UpdateAckTracker()
+    # The allowlists are fixed for the lifetime of the bot; freeze them once.
+    allowed_chat_ids = frozenset(allowed_chat_ids)
+    write_chat_ids = frozenset(write_chat_ids)
+    admin_chat_ids = frozenset(admin_chat_ids)
     limiter = CommandRateLimiter(
         window_sec=rate_limit_window_sec,
         per_chat_limit=rate_limit_per_chat,
         global_limit=rate_limit_global,
     )
     audit = TelegramAuditLogger(audit_log_file)
-    conversation_state: dict[int, dict[str, Any]] = {}
+    # LRU of per-chat NL context, bounded so a long-running bot does not grow forever.
+    conversation_state: OrderedDict[int, dict[str, Any]] = OrderedDict()
     nl_mode = resolve_telegram_nl_mode()
     llm_client = build_nl_llm_client_if_enabled(nl_mode=nl_mode)
     decision_why_mode = resolve_decision_why_mode()
@@ -202,156 +764,503 @@ def run_telegram_bot_loop(
         admin_chat_ids=admin_chat_ids,
     )
     last_notify_scan_ts = 0.0
+    last_notify_watermark: tuple[Any, ...] | None = None
+    marker_cache = NotificationMarkerCache()
+    # Notification fan-out runs on the poll thread; send to several chats at once.
+    broadcast_executor = (
+        ThreadPoolExecutor(
+            max_workers=min(len(notification_chat_ids), 8),
+            thread_name_prefix="agentpr-telegram-notify",
+        )
+        if len(notification_chat_ids) > 1
+        else None
+    )
+    dispatcher = ChatLaneDispatcher(
+        max_workers=parse_positive_int_env("AGENTPR_TELEGRAM_MAX_CONCURRENCY", 4),
+        audit=audit,
+    )
+    outbox = TelegramOutbox(client=client, audit=audit)
+
+    def reply(
+        *,
+        update_id: int,
+        chat_id: int,
+        command: str,
+        text: str,
+        outcome: str,
+        detail: str,
+        response: str,
+        received_at: float,
+    ) -> None:
+        # The outbox formats each (possibly merged) message once; the audit keeps
+        # the per-reply text as the user would see it on its own.
+        outbox.send(chat_id=chat_id, text=response)
+        audit.append(
+            build_audit_entry(
+                ts=received_at,
+                update_id=update_id,
+                chat_id=chat_id,
+                command=command,
+                text=text,
+                outcome=outcome,
+                detail=detail,
+                response=format_bot_response(response),
+            )
+        )
 
-    while True:
+    def run_update(
+        *,
+        update_id: int,
+        chat_id: int,
+        text: str,
+        command: str,
+        is_natural_language: bool,
+        chat_ctx: dict[str, Any],
+        received_at: float,
+    ) -> None:
         try:
-            updates = client.get_updates(offset=offset, timeout_sec=poll_timeout_sec)
-        except TelegramApiError as exc:
+            if is_natural_language:
+                response = handle_natural_language(
+                    text=text,
+                    service=service,
+                    db_path=db_path,
+                    workspace_root=workspace_root,
+                    integration_root=integration_root,
+                    project_root=project_root,
+                    list_limit=list_limit,
+                    conversation_state=chat_ctx,
+                    llm_client=llm_client,
+                    nl_mode=nl_mode,
+                    decision_llm_client=decision_llm_client,
+                    decision_why_mode=decision_why_mode,
+                )
+            else:
+                response = handle_bot_command(
+                    text=text,
+                    service=service,
+                    db_path=db_path,
+                    workspace_root=workspace_root,
+                    integration_root=integration_root,
+                    project_root=project_root,
+                    list_limit=list_limit,
+                    decision_llm_client=decision_llm_client,
+                    decision_why_mode=decision_why_mode,
+                )
+                sync_last_run_id_from_text(chat_ctx, text)
+            outcome = "ok"
+            detail = "nl" if is_natural_language else "command"
+        except Exception as exc:  # noqa: BLE001
+            response = f"Command failed: {exc}"
+            outcome = "error"
+            detail = str(exc)
+        reply(
+            update_id=update_id,
+            chat_id=chat_id,
+            command=command,
+            text=text,
+            outcome=outcome,
+            detail=detail,
+            response=response,
+            received_at=received_at,
+        )
+
+    intake_lock = threading.Lock()
+    # chat_id -> (update_ids, text, flush timer) for long pastes awaiting their next part.
+    held_messages: dict[int, tuple[tuple[int, ...], str, threading.Timer]] = {}
+
+    def accept_update(update: dict[str, Any]) -> None:
+        update_id = int(update.get("update_id", 0))
+        message = update.get("message") or update.get("edited_message")
+        if not isinstance(message, dict):
+            acks.finish(update_id)
+            return
+        text = str(message.get("text", "")).strip()
+        if not text:
+            acks.finish(update_id)
+            return
+        chat = message.get("chat")
+        if not isinstance(chat, dict) or "id" not in chat:
+            acks.finish(update_id)
+            return
+        chat_id = int(chat["id"])
+        if allowed_chat_ids and chat_id not in allowed_chat_ids:
+            # Audit and drop without replying, before touching held messages,
+            # conversation state, the limiter, the lanes or the outbox, so a flood
+            # from unknown chats costs no sends and grows no per-chat state.
             audit.append(
-                {
-                    "ts": datetime.now(UTC).isoformat(),
-                    "kind": "poll_error",
-                    "error": str(exc),
-                }
+                build_audit_entry(
+                    ts=time.time(),
+                    update_id=update_id,
+                    chat_id=chat_id,
+                    # A bounded head token only; unknown chats get no further parsing.
+                    command=(
+                        truncate_text(text[:64].split(None, 1)[0], 32)
+                        if text.startswith("/")
+                        else NL_DISPATCH_COMMAND
+                    ),
+                    text=text,
+                    outcome="unauthorized",
+                    detail="chat_not_allowlisted",
+                    response="",
+                )
             )
-            time.sleep(max(idle_sleep_sec, 1))
-            continue
-
-        now_scan_ts = time.monotonic()
-        if notify_enabled and (now_scan_ts - last_notify_scan_ts) >= float(notify_scan_sec):
-            maybe_emit_state_notifications(
-                client=client,
-                service=service,
-                notification_chat_ids=notification_chat_ids,
-                scan_limit=notify_scan_limit,
-                audit=audit,
+            acks.finish(update_id)
+            return
+        with intake_lock:
+            held = held_messages.pop(chat_id, None)
+            update_ids = (update_id,)
+            combined = text
+            if held is not None:
+                held[2].cancel()
+                if parse_command_name(text) is None:
+                    update_ids = (*held[0], update_id)
+                    combined = f"{held[1]}\n{text}"
+                else:
+                    # A command is never the continuation of a paste: send the
+                    # held text on its own, then handle the command separately.
+                    intake(update_ids=held[0], chat_id=chat_id, text=held[1])
+            if len(text) >= TELEGRAM_SPLIT_THRESHOLD_CHARS:
+                # Telegram clients split long pastes into several messages; wait
+                # briefly for the rest so the handler (and any LLM call) runs once.
+                timer = threading.Timer(LONG_MESSAGE_HOLD_SEC, flush_held_message, args=(chat_id,))
+                timer.daemon = True
+                held_messages[chat_id] = (update_ids, combined, timer)
+                timer.start()
+                return
+            intake(update_ids=update_ids, chat_id=chat_id, text=combined)
+
+    def flush_held_message(chat_id: int) -> None:
+        with intake_lock:
+            held = held_messages.pop(chat_id, None)
+            if held is not None:
+                intake(update_ids=held[0], chat_id=chat_id, text=held[1])
+
+    def flush_all_held_messages() -> None:
+        with intake_lock:
+            while held_messages:
+                chat_id, (update_ids, text, timer) = held_messages.popitem()
+                timer.cancel()
+                intake(update_ids=update_ids, chat_id=chat_id, text=text)
+
+    def intake(*, update_ids: tuple[int, ...], chat_id: int, text: str) -> None:
+        # Caller holds intake_lock. Merged pastes are audited under their last update.
+        update_id = update_ids[-1]
+
+        def submit(job: Callable[[], None]) -> None:
+            # Acknowledge the updates to Telegram only once the job has run.
+            def run() -> None:
+                try:
+                    job()
+                finally:
+                    acks.finish(*update_ids)
+
+            dispatcher.submit(chat_id, run)
+
+        received_at = time.time()
+        command = parse_command_name(text)
+        is_natural_language = command is None
+        normalized_command = command or NL_DISPATCH_COMMAND
+        chat_ctx = conversation_state.get(chat_id)
+        if chat_ctx is None:
+            chat_ctx = {}
+            conversation_state[chat_id] = chat_ctx
+            if len(conversation_state) > MAX_CONVERSATION_STATES:
+                conversation_state.popitem(last=False)
+        else:
+            conversation_state.move_to_end(chat_id)
+        now_ts = time.monotonic()
+        # Rate-limit before authorizing so permission-denied replies are paced too.
+        ok, rate_reason = limiter.allow(chat_id=chat_id, now_ts=now_ts)
+        if not ok:
+            base_response = (
+                "Rate limited. Please retry later."
+                if rate_reason == "chat_rate_limited"
+                else "System busy. Please retry later."
             )
-            maybe_emit_manager_notifications(
-                client=client,
-                service=service,
-                notification_chat_ids=notification_chat_ids,
-                scan_limit=notify_scan_limit,
-                audit=audit,
+            submit(
+                functools.partial(
+                    reply,
+                    update_id=update_id,
+                    chat_id=chat_id,
+                    command=normalized_command,
+                    text=text,
+                    outcome="rate_limited",
+                    detail=rate_reason or "",
+                    response=base_response,
+                    received_at=received_at,
+                ),
             )
-            last_notify_scan_ts = now_scan_ts
+            return
 
-        if not updates:
-            time.sleep(max(idle_sleep_sec, 1))
-            continue
+        allowed, reason = authorize_command(
+            chat_id=chat_id,
+            command=normalized_command,
+            write_chat_ids=write_chat_ids,
+            admin_chat_ids=admin_chat_ids,
+        )
+        if not allowed:
+            submit(
+                functools.partial(
+                    reply,
+                    update_id=update_id,
+                    chat_id=chat_id,
+                    command=normalized_command,
+                    text=text,
+                    outcome="unauthorized",
+                    detail=reason or "",
+                    response="Unauthorized command.",
+                    received_at=received_at,
+                ),
+            )
+            return
 
-        for update in updates:
-            update_id = int(update.get("update_id", 0))
-            offset = update_id + 1
-            message = update.get("message") or update.get("edited_message")
-            if not isinstance(message, dict):
-                continue
-            text = str(message.get("text", "")).strip()
-            if not text:
-                continue
-            chat = message.get("chat")
-            if not isinstance(chat, dict) or "id" not in chat:
-                continue
-            chat_id = int(chat["id"])
-            chat_ctx = conversation_state.setdefault(chat_id, {})
-            command = parse_command_name(text)
-            is_natural_language = command is None
-            normalized_command = command or NL_DISPATCH_COMMAND
-
-            now_ts = time.monotonic()
-            allow_chat = not allowed_chat_ids or chat_id in allowed_chat_ids
-            allowed, reason = authorize_command(
+        submit(
+            functools.partial(
+                run_update,
+                update_id=update_id,
                 chat_id=chat_id,
+                text=text,
                 command=normalized_command,
-                allow_chat=allow_chat,
-                write_chat_ids=write_chat_ids,
-                admin_chat_ids=admin_chat_ids,
+                is_natural_language=is_natural_language,
+                chat_ctx=chat_ctx,
+                received_at=received_at,
+            ),
+        )
+
+    def scan_notifications() -> None:
+        nonlocal last_notify_scan_ts, last_notify_watermark
+        now_scan_ts = time.monotonic()
+        if not notify_enabled or (now_scan_ts - last_notify_scan_ts) < float(notify_scan_sec):
+            return
+        if not notification_chat_ids:
+            return
+        # Nothing was written since the last complete scan, so nothing new to notify.
+        watermark = service.get_change_watermark()
+        if watermark == last_notify_watermark:
+            last_notify_scan_ts = now_scan_ts
+            return
+        undelivered = maybe_emit_state_notifications(
+            client=client,
+            service=service,
+            notification_chat_ids=notification_chat_ids,
+            scan_limit=notify_scan_limit,
+            audit=audit,
+            marker_cache=marker_cache,
+            executor=broadcast_executor,
+        )
+        undelivered += maybe_emit_manager_notifications(
+            client=client,
+            service=service,
+            notification_chat_ids=notification_chat_ids,
+            scan_limit=notify_scan_limit,
+            audit=audit,
+            marker_cache=marker_cache,
+            executor=broadcast_executor,
+        )
+        # Failed sends must be retried on the next scan even if nothing changed.
+        last_notify_watermark = watermark if undelivered == 0 else None
+        last_notify_scan_ts = now_scan_ts
+
+    try:
+        if resolve_telegram_mode() == TELEGRAM_MODE_WEBHOOK:
+            serve_telegram_webhook(
+                client=client,
+                accept_update=accept_update,
+                on_tick=scan_notifications,
+                tick_sec=max(idle_sleep_sec, 1),
+                audit=audit,
+            )
+            return
+        # getUpdates is refused while a webhook is registered, e.g. after
+        # switching AGENTPR_TELEGRAM_MODE back from webhook to poll.
+        try:
+            client.delete_webhook()
+        except TelegramApiError as exc:
+            audit.append(
+                {
+                    "ts": datetime.now(UTC).isoformat(),
+                    "kind": "delete_webhook_error",
+                    "error": str(exc),
+                }
             )
-            if not allowed:
-                response = format_bot_response("Unauthorized command.")
-                safe_send_message(client=client, chat_id=chat_id, text=response)
+        poll_failures = 0
+        while True:
+            try:
+                updates = client.get_updates(
+                    offset=acks.offset,
+                    timeout_sec=poll_timeout_sec,
+                    allowed_updates=TELEGRAM_ALLOWED_UPDATES,
+                    limit=100,
+                )
+            except TelegramApiError as exc:
+                poll_failures += 1
                 audit.append(
-                    build_audit_entry(
-                        update_id=update_id,
-                        chat_id=chat_id,
-                        command=normalized_command,
-                        text=text,
-                        outcome="unauthorized",
-                        detail=reason or "",
-                        response=response,
-                    )
+                    {
+                        "ts": datetime.now(UTC).isoformat(),
+                        "kind": "poll_error",
+                        "error": str(exc),
+                        "consecutive_failures": poll_failures,
+                    }
                 )
+                time.sleep(poll_error_backoff_sec(idle_sleep_sec, poll_failures))
                 continue
+            poll_failures = 0
+
+            scan_notifications()
+
+            # An empty result means the long poll already waited poll_timeout_sec.
+            fresh = 0
+            for update in updates:
+                if acks.begin(int(update.get("update_id", 0))):
+                    fresh += 1
+                    accept_update(update)
+            if updates and not fresh:
+                # Only still-running updates came back; wait for one to finish
+                # (or briefly, to pick up new ones) instead of re-polling at once.
+                acks.wait(UNACKED_UPDATE_REPOLL_SEC)
+    finally:
+        flush_all_held_messages()
+        dispatcher.shutdown(wait=True)
+        if broadcast_executor is not None:
+            broadcast_executor.shutdown(wait=True)
+        outbox.close()
+        audit.close()
+        client.close()
+
+
+def poll_error_backoff_sec(idle_sleep_sec: int, failures: int) -> float:
+    """Exponential backoff with +/-20% jitter after consecutive getUpdates failures."""
+    base = max(idle_sleep_sec, 1) * 2 ** min(max(failures - 1, 0), 16)
+    return min(base, POLL_ERROR_MAX_BACKOFF_SEC) * random.uniform(0.8, 1.2)
+
+
+def serve_telegram_webhook(
+    *,
+    client: TelegramClient,
+    accept_update: Callable[[dict[str, Any]], None],
+    on_tick: Callable[[], None],
+    tick_sec: int,
+    audit: TelegramAuditLogger,
+) -> None:
+    """Receive updates pushed by Telegram instead of long-polling getUpdates.
+
+    Registers ``AGENTPR_TELEGRAM_WEBHOOK_URL`` with ``setWebhook`` and serves it on
+    ``AGENTPR_TELEGRAM_WEBHOOK_HOST``/``PORT``; each request must carry the
+    ``AGENTPR_TELEGRAM_WEBHOOK_SECRET`` secret token. ``on_tick`` keeps running on
+    the calling thread every ``tick_sec`` seconds until interrupted.
+    """
+    webhook_url = str(os.environ.get("AGENTPR_TELEGRAM_WEBHOOK_URL") or "").strip()
+    secret = str(os.environ.get("AGENTPR_TELEGRAM_WEBHOOK_SECRET") or "").strip()
+    if not webhook_url:
+        raise ValueError("Missing AGENTPR_TELEGRAM_WEBHOOK_URL for AGENTPR_TELEGRAM_MODE=webhook.")
+    if not secret:
+        raise ValueError("Missing AGENTPR_TELEGRAM_WEBHOOK_SECRET for AGENTPR_TELEGRAM_MODE=webhook.")
+    host = str(os.environ.get("AGENTPR_TELEGRAM_WEBHOOK_HOST") or "127.0.0.1").strip()
+    port = parse_positive_int_env("AGENTPR_TELEGRAM_WEBHOOK_PORT", 8788)
+    path = urllib.parse.urlsplit(webhook_url).path or "/"
+
+    server = ThreadingHTTPServer(
+        (host, port),
+        _build_webhook_handler_class(
+            path=path,
+            secret=secret,
+            accept_update=accept_update,
+            audit=audit,
+        ),
+    )
+    server.daemon_threads = True
+    server_thread = threading.Thread(
+        target=server.serve_forever,
+        name="agentpr-telegram-webhook",
+        daemon=True,
+    )
+    server_thread.start()
+    try:
+        client.set_webhook(
+            url=webhook_url,
+            secret_token=secret,
+            allowed_updates=TELEGRAM_ALLOWED_UPDATES,
+        )
+        while True:
+            on_tick()
+            time.sleep(tick_sec)
+    finally:
+        server.shutdown()
+        server.server_close()
 
-            ok, rate_reason = limiter.allow(chat_id=chat_id, now_ts=now_ts)
-            if not ok:
-                base_response = (
-                    "Rate limited. Please retry later."
-                    if rate_reason == "chat_rate_limited"
-                    else "System busy. Please retry later."
-                )
-                response = format_bot_response(base_response)
-                safe_send_message(client=client, chat_id=chat_id, text=response)
+
+def _build_webhook_handler_class(
+    *,
+    path: str,
+    secret: str,
+    accept_update: Callable[[dict[str, Any]], None],
+    audit: TelegramAuditLogger,
+) -> type[BaseHTTPRequestHandler]:
+    class TelegramWebhookHandler(BaseHTTPRequestHandler):
+        # Drop connections that stall on headers or body, before the secret check.
+        timeout = TELEGRAM_WEBHOOK_REQUEST_TIMEOUT_SEC
+
+        def do_POST(self) -> None:  # noqa: N802
+            def reject(status_code: int, error: str) -> None:
+                self._send(status_code)
                 audit.append(
-                    build_audit_entry(
-                        update_id=update_id,
-                        chat_id=chat_id,
-                        command=normalized_command,
-                        text=text,
-                        outcome="rate_limited",
-                        detail=rate_reason or "",
-                        response=response,
-                    )
+                    {
+                        "ts": datetime.now(UTC).isoformat(),
+                        "kind": "webhook_rejected",
+                        "status_code": status_code,
+                        "error": error,
+                    }
                 )
-                continue
 
+            if urllib.parse.urlsplit(self.path).path != path:
+                reject(404, "not found")
+                return
+            token = self.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+            if not hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8")):
+                reject(401, "invalid secret token")
+                return
             try:
-                if is_natural_language:
-                    response = handle_natural_language(
-                        text=text,
-                        service=service,
-                        db_path=db_path,
-                        workspace_root=workspace_root,
-                        integration_root=integration_root,
-                        project_root=project_root,
-                        list_limit=list_limit,
-                        conversation_state=chat_ctx,
-                        llm_client=llm_client,
-                        nl_mode=nl_mode,
-                        decision_llm_client=decision_llm_client,
-                        decision_why_mode=decision_why_mode,
-                    )
-                else:
-                    response = handle_bot_command(
-                        text=text,
-                        service=service,
-                        db_path=db_path,
-                        workspace_root=workspace_root,
-                        integration_root=integration_root,
-                        project_root=project_root,
-                        list_limit=list_limit,
-                        decision_llm_client=decision_llm_client,
-                        decision_why_mode=decision_why_mode,
+                length = int(self.headers.get("Content-Length", "0"))
+            except ValueError:
+                reject(400, "invalid Content-Length")
+                return
+            if length < 0:
+                reject(400, "invalid Content-Length")
+                return
+            if length > TELEGRAM_WEBHOOK_MAX_BODY_BYTES:
+                reject(413, f"payload too large: {length} bytes")
+                return
+            try:
+                update = json.loads(self.rfile.read(length))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                reject(400, "invalid JSON")
+                return
+            if isinstance(update, dict):
+                try:
+                    accept_update(update)
+                except Exception as exc:  # noqa: BLE001
+                    # Acknowledge anyway; a non-2xx makes Telegram redeliver the update.
+                    audit.append(
+                        {
+                            "ts": datetime.now(UTC).isoformat(),
+                            "kind": "webhook_error",
+                            "error": str(exc),
+                        }
                     )
-                    sync_last_run_id_from_text(chat_ctx, text)
-                response = format_bot_response(response)
-                outcome = "ok"
-                detail = "nl" if is_natural_language else "command"
-            except Exception as exc:  # noqa: BLE001
-                response = format_bot_response(f"Command failed: {exc}")
-                outcome = "error"
-                detail = str(exc)
-            safe_send_message(client=client, chat_id=chat_id, text=response)
-            audit.append(
-                build_audit_entry(
-                    update_id=update_id,
-                    chat_id=chat_id,
-                    command=normalized_command,
-                    text=text,
-                    outcome=outcome,
-                    detail=detail,
-                    response=response,
-                )
-            )
+            self._send(200)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+            return
+
+        def _send(self, status_code: int) -> None:
+            body = b'{"ok":true}' if status_code == 200 else b'{"ok":false}'
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return TelegramWebhookHandler
 
 
 def load_notification_markers(service: OrchestratorService, run_id: str) -> set[str]:
@@ -366,6 +1275,78 @@ def load_notification_markers(service: OrchestratorService, run_id: str) -> set[
     return markers
 
 
+def load_notification_markers_bulk(
+    service: OrchestratorService,
+    run_ids: list[str],
+) -> dict[str, set[str]]:
+    markers_by_run: dict[str, set[str]] = {run_id: set() for run_id in run_ids}
+    rows = service.list_artifacts_for_runs(run_ids, artifact_type="bot_state_notify")
+    for row in rows:
+        metadata = row.get("metadata")
+        metadata = metadata if isinstance(metadata, dict) else {}
+        marker = str(metadata.get("marker_key") or "").strip()
+        if marker:
+            markers_by_run.setdefault(str(row.get("run_id") or ""), set()).add(marker)
+    return markers_by_run
+
+
+class NotificationMarkerCache:
+    """LRU of per-run notification markers, so each scan does not re-read them.
+
+    The bot is the only writer of ``bot_state_notify`` artifacts and adds every
+    marker it records via ``add``, so a cached set stays current. Passing the
+    run's ``updated_at`` as ``stamp`` still forces a reload once the run changed.
+    """
+
+    def __init__(self, *, max_runs: int = 4096) -> None:
+        self.max_runs = max(int(max_runs), 1)
+        self._entries: OrderedDict[str, tuple[str | None, set[str]]] = OrderedDict()
+
+    def get(
+        self,
+        service: OrchestratorService,
+        run_id: str,
+        *,
+        stamp: str | None = None,
+    ) -> set[str]:
+        entry = self._entries.get(run_id)
+        if entry is not None and (stamp is None or entry[0] == stamp):
+            self._entries.move_to_end(run_id)
+            return entry[1]
+        markers = load_notification_markers(service, run_id)
+        self._entries[run_id] = (stamp, markers)
+        self._entries.move_to_end(run_id)
+        if len(self._entries) > self.max_runs:
+            self._entries.popitem(last=False)
+        return markers
+
+    def prime(
+        self,
+        service: OrchestratorService,
+        stamps: dict[str, str | None],
+    ) -> None:
+        """Load every missing or stale entry in ``stamps`` with one bulk query."""
+        stale = [
+            run_id
+            for run_id, stamp in stamps.items()
+            if (entry := self._entries.get(run_id)) is None
+            or (stamp is not None and entry[0] != stamp)
+        ]
+        if not stale:
+            return
+        for run_id, markers in load_notification_markers_bulk(service, stale).items():
+            if run_id in stamps:
+                self._entries[run_id] = (stamps[run_id], markers)
+                self._entries.move_to_end(run_id)
+        while len(self._entries) > self.max_runs:
+            self._entries.popitem(last=False)
+
+    def add(self, run_id: str, marker_key: str) -> None:
+        entry = self._entries.get(run_id)
+        if entry is not None:
+            entry[1].add(marker_key)
+
+
 def record_notification_marker(
     *,
     service: OrchestratorService,
@@ -494,6 +1475,30 @@ def build_state_change_notification(
     return None
 
 
+def broadcast_message(
+    *,
+    client: TelegramClient,
+    chat_ids: list[int],
+    text: str,
+    executor: Executor | None = None,
+) -> bool:
+    """Send ``text`` to every chat, concurrently when an executor is given.
+
+    Returns True if at least one send succeeded.
+    """
+    if executor is None or len(chat_ids) < 2:
+        delivered = False
+        for chat_id in chat_ids:
+            ok = safe_send_message(client=client, chat_id=chat_id, text=text)
+            delivered = delivered or ok
+        return delivered
+    results = executor.map(
+        lambda chat_id: safe_send_message(client=client, chat_id=chat_id, text=text),
+        chat_ids,
+    )
+    return any(list(results))
+
+
 def maybe_emit_state_notifications(
     *,
     client: TelegramClient,
@@ -501,19 +1506,36 @@ def maybe_emit_state_notifications(
     notification_chat_ids: list[int],
     scan_limit: int,
     audit: TelegramAuditLogger,
-) -> None:
+    marker_cache: NotificationMarkerCache | None = None,
+    executor: Executor | None = None,
+) -> int:
+    """Notify chats about runs that reached a notify-worthy state.
+
+    Returns the number of notifications that could not be delivered to any chat.
+    """
     if not notification_chat_ids:
-        return
-    rows = service.list_runs(limit=max(int(scan_limit), 1))
+        return 0
+    if marker_cache is None:
+        marker_cache = NotificationMarkerCache()
+    undelivered = 0
+    rows = service.list_runs(limit=max(int(scan_limit), 1), states=NOTIFY_SCAN_STATES)
+    marker_cache.prime(
+        service,
+        {
+            str(row.get("run_id") or "").strip(): str(row.get("updated_at") or "")
+            for row in rows
+        },
+    )
     for row in rows:
         run_id = str(row.get("run_id") or "").strip()
         state = str(row.get("display_state") or row.get("current_state") or "").strip()
         if not run_id or not state:
             continue
-        should_scan = state in NOTIFY_TERMINAL_STATES or state == RunState.ITERATING.value
-        if not should_scan:
+        if state not in NOTIFY_SCAN_STATES:
             continue
-        marker_set = load_notification_markers(service, run_id)
+        marker_set = marker_cache.get(
+            service, run_id, stamp=str(row.get("updated_at") or "")
+        )
         marker_key = f"state:{state}"
         event_id: int | None = None
         if state == RunState.ITERATING.value:
@@ -538,11 +1560,14 @@ def maybe_emit_state_notifications(
         )
         if not text:
             continue
-        delivered = False
-        for chat_id in notification_chat_ids:
-            ok = safe_send_message(client=client, chat_id=chat_id, text=format_bot_response(text))
-            delivered = delivered or ok
+        delivered = broadcast_message(
+            client=client,
+            chat_ids=notification_chat_ids,
+            text=format_bot_response(text),
+            executor=executor,
+        )
         if not delivered:
+            undelivered += 1
             continue
         record_notification_marker(
             service=service,
@@ -551,6 +1576,7 @@ def maybe_emit_state_notifications(
             state=state,
             event_id=event_id,
         )
+        marker_cache.add(run_id, marker_key)
         audit.append(
             {
                 "ts": datetime.now(UTC).isoformat(),
@@ -561,6 +1587,7 @@ def maybe_emit_state_notifications(
                 "chat_count": len(notification_chat_ids),
             }
         )
+    return undelivered
 
 
 def maybe_emit_manager_notifications(
@@ -570,20 +1597,36 @@ def maybe_emit_manager_notifications(
     notification_chat_ids: list[int],
     scan_limit: int,
     audit: TelegramAuditLogger,
-) -> None:
-    """Push unsent manager_notification artifacts to Telegram."""
+    marker_cache: NotificationMarkerCache | None = None,
+    executor: Executor | None = None,
+) -> int:
+    """Push unsent manager_notification artifacts to Telegram.
+
+    Returns the number of notifications that could not be delivered to any chat.
+    """
     if not notification_chat_ids:
-        return
+        return 0
+    if marker_cache is None:
+        marker_cache = NotificationMarkerCache()
+    undelivered = 0
     artifacts = service.list_artifacts_global(
         artifact_type="manager_notification", limit=max(int(scan_limit), 1)
     )
+    marker_cache.prime(
+        service,
+        {
+            str(artifact.get("run_id") or "").strip(): None
+            for artifact in artifacts
+            if artifact.get("id") and str(artifact.get("run_id") or "").strip()
+        },
+    )
     for artifact in artifacts:
         artifact_id = artifact.get("id")
         run_id = str(artifact.get("run_id") or "").strip()
         if not artifact_id or not run_id:
             continue
         marker_key = f"mgr_notify:{artifact_id}"
-        markers = load_notification_markers(service, run_id)
+        markers = marker_cache.get(service, run_id)
         if marker_key in markers:
             continue
         meta = artifact.get("metadata")
@@ -594,15 +1637,19 @@ def maybe_emit_manager_notifications(
             continue
         prefix = f"[{priority.upper()}] " if priority in {"high", "urgent"} else ""
         text = f"{prefix}{run_id}: {message}"
-        delivered = False
-        for chat_id in notification_chat_ids:
-            ok = safe_send_message(client=client, chat_id=chat_id, text=format_bot_response(text))
-            delivered = delivered or ok
+        delivered = broadcast_message(
+            client=client,
+            chat_ids=notification_chat_ids,
+            text=format_bot_response(text),
+            executor=executor,
+        )
         if not delivered:
+            undelivered += 1
             continue
         record_notification_marker(
             service=service, run_id=run_id, marker_key=marker_key, state="manager_notification"
         )
+        marker_cache.add(run_id, marker_key)
         audit.append(
             {
                 "ts": datetime.now(UTC).isoformat(),
@@ -612,6 +1659,7 @@ def maybe_emit_manager_notifications(
                 "priority": priority,
             }
         )
+    return undelivered
 
 
 def parse_create_command_args(args: list[str]) -> tuple[list[str], str] | None:
@@ -748,18 +1796,27 @@ def load_artifact_payload(
     uri = str(artifact.get("uri") or "").strip()
     if not uri:
         return None, artifact
-    path = Path(uri)
-    if not path.exists():
-        return None, artifact
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        stat = os.stat(uri)
+    except OSError:
         return None, artifact
-    if not isinstance(payload, dict):
+    payload = _read_json_object_file(uri, stat.st_mtime_ns, stat.st_size)
+    if payload is None:
         return None, artifact
     return payload, artifact
 
 
+@functools.lru_cache(maxsize=256)
+def _read_json_object_file(path: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    # mtime/size are part of the cache key so a rewritten file is re-read.
+    # Callers must treat the returned dict as read-only; it is shared.
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
 def render_run_detail(
     *,
     service: OrchestratorService,
@@ -770,9 +1827,10 @@ def render_run_detail(
 ) -> str:
     run = snapshot["run"]
     state = str(snapshot["state"])
+    repo_ref = f"{run['owner']}/{run['repo']}"
     lines = [
         f"run_id: {run['run_id']}",
-        f"repo: {run['owner']}/{run['repo']}",
+        f"repo: {repo_ref}",
         f"state: {state}",
         f"pr_number: {run.get('pr_number')}",
         f"workspace: {run['workspace_dir']}",
@@ -853,10 +1911,12 @@ def render_run_detail(
     why_llm_actions: list[str] = []
     if decision_why_mode != DECISION_WHY_MODE_OFF and decision_llm_client is not None:
         try:
-            explanation = decision_llm_client.explain_decision_card(
+            why_llm_raw, actions_raw = explain_decision_card_cached(
+                client=decision_llm_client,
+                attempt_no=attempt.get("attempt_no"),
                 decision_card={
                     "run_id": run_id,
-                    "repo": f"{run['owner']}/{run['repo']}",
+                    "repo": repo_ref,
                     "state": {"before": state_before, "after": state_after},
                     "classification": {
                         "grade": grade,
@@ -877,12 +1937,10 @@ def render_run_detail(
                         "added_lines": added_lines,
                         "deleted_lines": deleted_lines,
                     },
-                }
+                },
             )
-            why_llm_text = clamp_str(explanation.why_llm, max_len=280)
-            why_llm_actions = [
-                clamp_str(item, max_len=180) for item in explanation.suggested_actions
-            ][:3]
+            why_llm_text = clamp_str(why_llm_raw, max_len=280)
+            why_llm_actions = [clamp_str(item, max_len=180) for item in actions_raw][:3]
         except ManagerLLMError:
             why_llm_text = ""
 
@@ -962,10 +2020,85 @@ def render_run_detail(
     return "\n".join(lines)
 
 
+def explain_decision_card_cached(
+    *,
+    client: ManagerLLMClient,
+    decision_card: dict[str, Any],
+    attempt_no: Any = None,
+) -> tuple[str, tuple[str, ...]]:
+    """Return (why_llm, suggested_actions), reusing a previous answer for the same card.
+
+    Failures raise ManagerLLMError as before and are not cached.
+    """
+    config = client.config
+    key = (
+        config.api_base,
+        config.model,
+        attempt_no,
+        json.dumps(decision_card, sort_keys=True, ensure_ascii=False),
+    )
+    with _DECISION_EXPLAIN_CACHE_LOCK:
+        cached = _DECISION_EXPLAIN_CACHE.get(key)
+        if cached is not None:
+            _DECISION_EXPLAIN_CACHE.move_to_end(key)
+            return cached
+    explanation = client.explain_decision_card(decision_card=decision_card)
+    result = (explanation.why_llm, tuple(explanation.suggested_actions))
+    with _DECISION_EXPLAIN_CACHE_LOCK:
+        _DECISION_EXPLAIN_CACHE[key] = result
+        _DECISION_EXPLAIN_CACHE.move_to_end(key)
+        while len(_DECISION_EXPLAIN_CACHE) > DECISION_EXPLAIN_CACHE_MAX_ENTRIES:
+            _DECISION_EXPLAIN_CACHE.popitem(last=False)
+    return result
+
+
 def render_overview(*, service: OrchestratorService, list_limit: int) -> str:
-    runs = service.list_runs(limit=max(1, min(int(list_limit), 50)))
+    """Render the /overview text, reusing a recent render while the database is unchanged.
+
+    Concurrent callers with the same key wait for the render already in progress.
+    """
+    key = (str(service.db.db_path), int(list_limit), service.get_change_watermark())
+    now = time.monotonic()
+    with _OVERVIEW_CACHE_LOCK:
+        cached = _OVERVIEW_CACHE.get(key)
+        if cached is not None and now - cached[0] < OVERVIEW_CACHE_TTL_SEC:
+            return cached[1]
+        inflight = _OVERVIEW_INFLIGHT.get(key)
+        if inflight is None:
+            future: Future[str] = Future()
+            _OVERVIEW_INFLIGHT[key] = future
+    if inflight is not None:
+        return inflight.result()
+    try:
+        text = _render_overview_uncached(service=service, list_limit=list_limit)
+    except BaseException as exc:
+        with _OVERVIEW_CACHE_LOCK:
+            _OVERVIEW_INFLIGHT.pop(key, None)
+        future.set_exception(exc)
+        raise
+    with _OVERVIEW_CACHE_LOCK:
+        _OVERVIEW_INFLIGHT.pop(key, None)
+        _OVERVIEW_CACHE[key] = (now, text)
+        _OVERVIEW_CACHE.move_to_end(key)
+        while len(_OVERVIEW_CACHE) > OVERVIEW_CACHE_MAX_ENTRIES:
+            _OVERVIEW_CACHE.popitem(last=False)
+    future.set_result(text)
+    return text
+
+
+def _render_overview_uncached(*, service: OrchestratorService, list_limit: int) -> str:
+    limit = max(1, min(int(list_limit), 50))
+    # Sequential on purpose: renders are cached and single-flighted, so a
+    # thread per render buys little, and "No runs." skips the stats queries.
+    runs = service.list_runs_with_pending_pr(limit=limit)
     if not runs:
         return "No runs."
+    lines = _overview_run_lines(runs)
+    lines.extend(_overview_stats_lines(service=service, limit=limit))
+    return "\n".join(lines)
+
+
+def _overview_run_lines(runs: list[dict[str, Any]]) -> list[str]:
     lines: list[str] = []
     lines.append(f"Total recent runs: {len(runs)}")
     latest = runs[0]
@@ -1006,12 +2139,10 @@ def render_overview(*, service: OrchestratorService, list_limit: int) -> str:
 
     pending_pr_lines: list[str] = []
     for row in runs:
-        if row.get("current_state") != RunState.PUSHED.value:
-            continue
-        run_id = str(row["run_id"])
-        artifact = service.latest_artifact(run_id, artifact_type="pr_open_request")
+        artifact = row.get("pr_open_request")
         if artifact is None:
             continue
+        run_id = str(row["run_id"])
         expires_at = artifact["metadata"].get("expires_at", "?")
         pending_pr_lines.append(
             f"- {run_id} | {row['owner']}/{row['repo']} | expires={expires_at}"
@@ -1021,11 +2152,13 @@ def render_overview(*, service: OrchestratorService, list_limit: int) -> str:
     if pending_pr_lines:
         lines.append("Pending PR approvals:")
         lines.extend(pending_pr_lines)
+    return lines
 
-    try:
-        from .manager_tools import get_global_stats
 
-        stats = get_global_stats(service=service, limit=max(1, min(int(list_limit), 50)))
+def _overview_stats_lines(*, service: OrchestratorService, limit: int) -> list[str]:
+    lines: list[str] = []
+    try:
+        stats = get_global_stats(service=service, limit=limit)
         if stats.get("ok") and stats.get("digest_available_runs", 0) > 0:
             lines.append(
                 f"Pass rate: {stats['pass_rate_pct']}%"
@@ -1041,8 +2174,21 @@ def render_overview(*, service: OrchestratorService, list_limit: int) -> str:
                 lines.append("Top reasons: " + ", ".join(reason_parts))
     except Exception:  # noqa: BLE001
         pass  # Stats are best-effort
+    return lines
 
-    return "\n".join(lines)
+
+@dataclass(frozen=True)
+class BotCommandContext:
+    command: str
+    args: list[str]
+    service: OrchestratorService
+    db_path: Path
+    workspace_root: Path
+    integration_root: Path
+    project_root: Path
+    list_limit: int
+    decision_llm_client: ManagerLLMClient | None
+    decision_why_mode: str | None
 
 
 def handle_bot_command(
@@ -1058,184 +2204,217 @@ def handle_bot_command(
     decision_why_mode: str | None = None,
 ) -> str:
     try:
-        parts = shlex.split(text)
+        parts = split_command_text(text)
     except ValueError:
         return "Invalid command format."
     if not parts:
         return "Empty command."
+    command = parts[0].split("@", 1)[0].lower()
+    handler = _COMMAND_HANDLERS.get(command)
+    if handler is None:
+        return "Unknown command. Use /help."
+    return handler(
+        BotCommandContext(
+            command=command,
+            args=parts[1:],
+            service=service,
+            db_path=db_path,
+            workspace_root=workspace_root,
+            integration_root=integration_root,
+            project_root=project_root,
+            list_limit=list_limit,
+            decision_llm_client=decision_llm_client,
+            decision_why_mode=decision_why_mode,
+        )
+    )
+
+
+BOT_HELP_TEXT = (
+    "Commands:\n"
+    "/create <owner/repo|github_url>... [--prompt-version vX]\n"
+    "/overview\n"
+    "/list [N]\n"
+    "/show <run_id>\n"
+    "/status <run_id>\n"
+    "/pending_pr [N]\n"
+    "/approve_pr <run_id> <confirm_token>\n"
+    "/pause <run_id>\n"
+    "/resume <run_id> <target_state>\n"
+    "/retry <run_id> <target_state>"
+)
+
+
+def _cmd_help(ctx: BotCommandContext) -> str:
+    return BOT_HELP_TEXT
+
+
+def _cmd_create(ctx: BotCommandContext) -> str:
+    parsed = parse_create_command_args(ctx.args)
+    if parsed is None:
+        return "Usage: /create <owner/repo|github_url>... [--prompt-version vX]"
+    repo_refs, prompt_version = parsed
+    if not repo_refs:
+        return "At least one repo ref is required."
+    return create_runs_from_refs(
+        repo_refs=repo_refs,
+        prompt_version=prompt_version,
+        service=ctx.service,
+        db_path=ctx.db_path,
+        workspace_root=ctx.workspace_root,
+        integration_root=ctx.integration_root,
+        project_root=ctx.project_root,
+    )
+
+
+def _cmd_list(ctx: BotCommandContext) -> str:
+    limit = ctx.list_limit
+    if ctx.args:
+        try:
+            limit = max(1, min(int(ctx.args[0]), 50))
+        except ValueError:
+            return "Usage: /list [N]"
+    runs = ctx.service.list_runs(limit=limit)
+    if not runs:
+        return "No runs."
+    lines = ["Latest runs:"]
+    for row in runs:
+        state = str(row.get("display_state") or row.get("current_state") or "UNKNOWN")
+        lines.append(
+            f"{row['run_id']} | {row['repo']} | {state}"
+        )
+    return "\n".join(lines)
+
+
+def _cmd_overview(ctx: BotCommandContext) -> str:
+    return render_overview(service=ctx.service, list_limit=ctx.list_limit)
+
+
+def _cmd_show(ctx: BotCommandContext) -> str:
+    if len(ctx.args) != 1:
+        return f"Usage: {ctx.command} <run_id>"
+    run_id = ctx.args[0]
+    try:
+        snapshot = ctx.service.get_run_snapshot(run_id)
+    except KeyError:
+        return f"Run not found: {run_id}"
     resolved_why_mode = (
-        str(decision_why_mode).strip().lower()
-        if decision_why_mode is not None
+        str(ctx.decision_why_mode).strip().lower()
+        if ctx.decision_why_mode is not None
         else resolve_decision_why_mode()
     )
     if resolved_why_mode not in DECISION_WHY_MODES:
         resolved_why_mode = DECISION_WHY_MODE_HYBRID
-    resolved_decision_llm_client = decision_llm_client
+    resolved_decision_llm_client = ctx.decision_llm_client
     if resolved_decision_llm_client is None and resolved_why_mode != DECISION_WHY_MODE_OFF:
         resolved_decision_llm_client = build_decision_llm_client_if_enabled(
             decision_why_mode=resolved_why_mode,
             fallback_client=None,
         )
+    return render_run_detail(
+        service=ctx.service,
+        run_id=run_id,
+        snapshot=snapshot,
+        decision_llm_client=resolved_decision_llm_client,
+        decision_why_mode=resolved_why_mode,
+    )
 
-    command = parts[0].split("@", 1)[0].lower()
-    args = parts[1:]
 
-    if command in {"/start", "/help"}:
-        return (
-            "Commands:\n"
-            "/create <owner/repo|github_url>... [--prompt-version vX]\n"
-            "/overview\n"
-            "/list [N]\n"
-            "/show <run_id>\n"
-            "/status <run_id>\n"
-            "/pending_pr [N]\n"
-            "/approve_pr <run_id> <confirm_token>\n"
-            "/pause <run_id>\n"
-            "/resume <run_id> <target_state>\n"
-            "/retry <run_id> <target_state>"
-        )
+def _cmd_pending_pr(ctx: BotCommandContext) -> str:
+    limit = ctx.list_limit
+    if ctx.args:
+        try:
+            limit = max(1, min(int(ctx.args[0]), 50))
+        except ValueError:
+            return "Usage: /pending_pr [N]"
+    lines: list[str] = []
+    for row in ctx.service.list_pending_pr_requests(limit=limit):
+        expires_at = row["metadata"].get("expires_at", "?")
+        lines.append(f"{row['run_id']} | {row['repo']} | expires={expires_at}")
+    if not lines:
+        return "No pending PR approval requests."
+    return "Pending PR requests:\n" + "\n".join(lines)
 
-    if command == "/create":
-        parsed = parse_create_command_args(args)
-        if parsed is None:
-            return "Usage: /create <owner/repo|github_url>... [--prompt-version vX]"
-        repo_refs, prompt_version = parsed
-        if not repo_refs:
-            return "At least one repo ref is required."
-        return create_runs_from_refs(
-            repo_refs=repo_refs,
-            prompt_version=prompt_version,
-            service=service,
-            db_path=db_path,
-            workspace_root=workspace_root,
-            integration_root=integration_root,
-            project_root=project_root,
-        )
 
-    if command == "/list":
-        limit = list_limit
-        if args:
-            try:
-                limit = max(1, min(int(args[0]), 50))
-            except ValueError:
-                return "Usage: /list [N]"
-        runs = service.list_runs(limit=limit)
-        if not runs:
-            return "No runs."
-        lines = ["Latest runs:"]
-        for row in runs:
-            state = str(row.get("display_state") or row.get("current_state") or "UNKNOWN")
-            lines.append(
-                f"{row['run_id']} | {row['repo']} | {state}"
-            )
-        return "\n".join(lines)
+def _cmd_approve_pr(ctx: BotCommandContext) -> str:
+    if len(ctx.args) != 2:
+        return "Usage: /approve_pr <run_id> <confirm_token>"
+    run_id = ctx.args[0]
+    confirm_token = ctx.args[1]
+    artifact = ctx.service.latest_artifact(run_id, artifact_type="pr_open_request")
+    if artifact is None:
+        return f"No pr_open_request found for run: {run_id}"
+    request_file = artifact["uri"]
+    result = run_cli_command(
+        [
+            "approve-open-pr",
+            "--run-id",
+            run_id,
+            "--request-file",
+            request_file,
+            "--confirm-token",
+            confirm_token,
+            "--confirm",
+        ],
+        db_path=ctx.db_path,
+        workspace_root=ctx.workspace_root,
+        integration_root=ctx.integration_root,
+        project_root=ctx.project_root,
+    )
+    if not result["ok"]:
+        return f"approve-open-pr failed: {result['text']}"
+    return f"approve-open-pr done: {result['text']}"
+
+
+def _cmd_pause(ctx: BotCommandContext) -> str:
+    if len(ctx.args) != 1:
+        return "Usage: /pause <run_id>"
+    return run_and_render_action(
+        ["pause", "--run-id", ctx.args[0]],
+        db_path=ctx.db_path,
+        workspace_root=ctx.workspace_root,
+        integration_root=ctx.integration_root,
+        project_root=ctx.project_root,
+    )
 
-    if command == "/overview":
-        return render_overview(service=service, list_limit=list_limit)
 
-    if command in {"/show", "/status"}:
-        if len(args) != 1:
-            return f"Usage: {command} <run_id>"
-        run_id = args[0]
-        try:
-            snapshot = service.get_run_snapshot(run_id)
-        except KeyError:
-            return f"Run not found: {run_id}"
-        return render_run_detail(
-            service=service,
-            run_id=run_id,
-            snapshot=snapshot,
-            decision_llm_client=resolved_decision_llm_client,
-            decision_why_mode=resolved_why_mode,
-        )
+def _cmd_resume(ctx: BotCommandContext) -> str:
+    if len(ctx.args) != 2:
+        return "Usage: /resume <run_id> <target_state>"
+    return run_and_render_action(
+        ["resume", "--run-id", ctx.args[0], "--target-state", ctx.args[1]],
+        db_path=ctx.db_path,
+        workspace_root=ctx.workspace_root,
+        integration_root=ctx.integration_root,
+        project_root=ctx.project_root,
+    )
 
-    if command == "/pending_pr":
-        limit = list_limit
-        if args:
-            try:
-                limit = max(1, min(int(args[0]), 50))
-            except ValueError:
-                return "Usage: /pending_pr [N]"
-        runs = service.list_runs(limit=200)
-        lines: list[str] = []
-        for row in runs:
-            if row.get("current_state") != RunState.PUSHED.value:
-                continue
-            run_id = str(row["run_id"])
-            artifact = service.latest_artifact(run_id, artifact_type="pr_open_request")
-            if artifact is None:
-                continue
-            expires_at = artifact["metadata"].get("expires_at", "?")
-            lines.append(f"{run_id} | {row['repo']} | expires={expires_at}")
-            if len(lines) >= limit:
-                break
-        if not lines:
-            return "No pending PR approval requests."
-        return "Pending PR requests:\n" + "\n".join(lines)
-
-    if command == "/approve_pr":
-        if len(args) != 2:
-            return "Usage: /approve_pr <run_id> <confirm_token>"
-        run_id = args[0]
-        confirm_token = args[1]
-        artifact = service.latest_artifact(run_id, artifact_type="pr_open_request")
-        if artifact is None:
-            return f"No pr_open_request found for run: {run_id}"
-        request_file = artifact["uri"]
-        result = run_cli_command(
-            [
-                "approve-open-pr",
-                "--run-id",
-                run_id,
-                "--request-file",
-                request_file,
-                "--confirm-token",
-                confirm_token,
-                "--confirm",
-            ],
-            db_path=db_path,
-            workspace_root=workspace_root,
-            integration_root=integration_root,
-            project_root=project_root,
-        )
-        if not result["ok"]:
-            return f"approve-open-pr failed: {result['text']}"
-        return f"approve-open-pr done: {result['text']}"
-
-    if command == "/pause":
-        if len(args) != 1:
-            return "Usage: /pause <run_id>"
-        return run_and_render_action(
-            ["pause", "--run-id", args[0]],
-            db_path=db_path,
-            workspace_root=workspace_root,
-            integration_root=integration_root,
-            project_root=project_root,
-        )
 
-    if command == "/resume":
-        if len(args) != 2:
-            return "Usage: /resume <run_id> <target_state>"
-        return run_and_render_action(
-            ["resume", "--run-id", args[0], "--target-state", args[1]],
-            db_path=db_path,
-            workspace_root=workspace_root,
-            integration_root=integration_root,
-            project_root=project_root,
-        )
+def _cmd_retry(ctx: BotCommandContext) -> str:
+    if len(ctx.args) != 2:
+        return "Usage: /retry <run_id> <target_state>"
+    return run_and_render_action(
+        ["retry", "--run-id", ctx.args[0], "--target-state", ctx.args[1]],
+        db_path=ctx.db_path,
+        workspace_root=ctx.workspace_root,
+        integration_root=ctx.integration_root,
+        project_root=ctx.project_root,
+    )
 
-    if command == "/retry":
-        if len(args) != 2:
-            return "Usage: /retry <run_id> <target_state>"
-        return run_and_render_action(
-            ["retry", "--run-id", args[0], "--target-state", args[1]],
-            db_path=db_path,
-            workspace_root=workspace_root,
-            integration_root=integration_root,
-            project_root=project_root,
-        )
 
-    return "Unknown command. Use /help."
+_COMMAND_HANDLERS: dict[str, Callable[[BotCommandContext], str]] = {
+    "/start": _cmd_help,
+    "/help": _cmd_help,
+    "/create": _cmd_create,
+    "/list": _cmd_list,
+    "/overview": _cmd_overview,
+    "/show": _cmd_show,
+    "/status": _cmd_show,
+    "/pending_pr": _cmd_pending_pr,
+    "/approve_pr": _cmd_approve_pr,
+    "/pause": _cmd_pause,
+    "/resume": _cmd_resume,
+    "/retry": _cmd_retry,
+}
 
 
 def handle_natural_language(
@@ -1256,9 +2435,11 @@ def handle_natural_language(
     mode = str(nl_mode).strip().lower()
     if mode not in NL_MODES:
         mode = NL_MODE_RULES
+    normalized = str(text).strip()
+    explicit_run_id = extract_run_id_from_text(normalized)
     if mode == NL_MODE_RULES:
         return handle_natural_language_rules(
-            text=text,
+            text=normalized,
             service=service,
             db_path=db_path,
             workspace_root=workspace_root,
@@ -1266,6 +2447,7 @@ def handle_natural_language(
             project_root=project_root,
             list_limit=list_limit,
             conversation_state=conversation_state,
+            explicit_run_id=explicit_run_id,
             decision_llm_client=decision_llm_client,
             decision_why_mode=decision_why_mode,
         )
@@ -1277,7 +2459,7 @@ def handle_natural_language(
                 "and optionally AGENTPR_TELEGRAM_NL_MODEL/AGENTPR_TELEGRAM_NL_API_BASE."
             )
         return handle_natural_language_rules(
-            text=text,
+            text=normalized,
             service=service,
             db_path=db_path,
             workspace_root=workspace_root,
@@ -1285,14 +2467,13 @@ def handle_natural_language(
             project_root=project_root,
             list_limit=list_limit,
             conversation_state=conversation_state,
+            explicit_run_id=explicit_run_id,
             decision_llm_client=decision_llm_client,
             decision_why_mode=decision_why_mode,
         )
 
-    normalized = str(text).strip()
     if not normalized:
         return "Empty message."
-    explicit_run_id = extract_run_id_from_text(normalized)
     if explicit_run_id:
         set_last_run_id(conversation_state, explicit_run_id)
     llm_context = {
@@ -1300,7 +2481,7 @@ def handle_natural_language(
         "explicit_run_id": explicit_run_id,
         "states": [state.value for state in RunState],
         "recent_runs": service.list_runs(limit=min(max(int(list_limit), 1), 8)),
-        "commands": list(BOT_NL_ALLOWED_ACTIONS),
+        "commands": BOT_NL_ALLOWED_ACTIONS,
         "nl_mode": mode,
     }
     try:
@@ -1312,7 +2493,7 @@ def handle_natural_language(
     except ManagerLLMError as exc:
         if mode == NL_MODE_HYBRID:
             fallback = handle_natural_language_rules(
-                text=text,
+                text=normalized,
                 service=service,
                 db_path=db_path,
                 workspace_root=workspace_root,
@@ -1320,16 +2501,17 @@ def handle_natural_language(
                 project_root=project_root,
                 list_limit=list_limit,
                 conversation_state=conversation_state,
+                explicit_run_id=explicit_run_id,
                 decision_llm_client=decision_llm_client,
                 decision_why_mode=decision_why_mode,
             )
             return f"[manager:rules_fallback] {fallback}"
         return f"manager nl routing failed: {exc}"
 
-    if selection.action not in BOT_NL_ALLOWED_ACTIONS:
+    if selection.action not in BOT_NL_ALLOWED_ACTION_SET:
         if mode == NL_MODE_HYBRID:
             fallback = handle_natural_language_rules(
-                text=text,
+                text=normalized,
                 service=service,
                 db_path=db_path,
                 workspace_root=workspace_root,
@@ -1337,6 +2519,7 @@ def handle_natural_language(
                 project_root=project_root,
                 list_limit=list_limit,
                 conversation_state=conversation_state,
+                explicit_run_id=explicit_run_id,
                 decision_llm_client=decision_llm_client,
                 decision_why_mode=decision_why_mode,
             )
@@ -1370,6 +2553,7 @@ def handle_natural_language_rules(
     project_root: Path,
     list_limit: int,
     conversation_state: dict[str, Any],
+    explicit_run_id: str | None,
     decision_llm_client: ManagerLLMClient | None,
     decision_why_mode: str | None,
 ) -> str:
@@ -1389,53 +2573,43 @@ def handle_natural_language_rules(
     normalized = str(text).strip()
     if not normalized:
         return "Empty message."
-    lowered = normalized.lower()
-    explicit_run_id = extract_run_id_from_text(normalized)
+    intents = match_nl_intents(normalized.lower())
     if explicit_run_id:
         set_last_run_id(conversation_state, explicit_run_id)
     run_id = explicit_run_id or get_last_run_id(conversation_state)
 
-    if contains_any(lowered, ["help", "规则", "命令", "commands"]):
+    if "help" in intents:
         return "自然语言模式已启用。你可以直接描述需求，manager 会路由到对应动作。"
 
-    if contains_any(lowered, ["create", "new run", "创建", "新建", "跑这个repo", "跑这个仓库"]):
+    if "create" in intents:
         repo_refs = extract_repo_refs_text(normalized)
         if repo_refs:
             prompt_version = extract_prompt_version_from_text(normalized) or resolve_default_prompt_version()
             argv = ["/create", *repo_refs, "--prompt-version", prompt_version]
             return dispatch_bot(" ".join(argv))
 
-    if contains_any(lowered, ["list", "all runs", "运行列表", "全部运行", "列出"]):
+    if "list" in intents:
         limit = max(1, min(int(list_limit), 50))
         return dispatch_bot(f"/list {limit}")
 
-    if run_id and contains_any(
-        lowered,
-        ["status", "show", "state", "状态", "进展", "情况"],
-    ):
+    if run_id and "show" in intents:
         return dispatch_bot(f"/show {run_id}")
 
-    if contains_any(lowered, ["status", "overall", "overview", "目前", "整体", "全局", "近况", "情况"]):
+    if "overview" in intents:
         return dispatch_bot("/overview")
 
-    if run_id and contains_any(lowered, ["pause", "暂停"]):
+    if run_id and "pause" in intents:
         return dispatch_bot(f"/pause {run_id}")
 
-    if run_id and contains_any(lowered, ["resume", "恢复", "继续"]):
-        target = normalize_target_state(
-            extract_target_state_from_text(normalized),
-            default=DEFAULT_TARGET_STATE,
-        )
+    if run_id and "resume" in intents:
+        target = resolve_target_state(normalized, default=DEFAULT_TARGET_STATE)
         return dispatch_bot(f"/resume {run_id} {target}")
 
-    if run_id and contains_any(lowered, ["retry", "重试"]):
-        target = normalize_target_state(
-            extract_target_state_from_text(normalized),
-            default=DEFAULT_TARGET_STATE,
-        )
+    if run_id and "retry" in intents:
+        target = resolve_target_state(normalized, default=DEFAULT_TARGET_STATE)
         return dispatch_bot(f"/retry {run_id} {target}")
 
-    if contains_any(lowered, ["manager tick", "推进", "继续跑", "next step", "run tick"]):
+    if "manager_tick" in intents:
         argv = ["manager-tick", "--limit", str(max(1, min(int(list_limit), 50)))]
         if run_id:
             argv.extend(["--run-id", run_id])
@@ -1450,7 +2624,7 @@ def handle_natural_language_rules(
             return f"manager-tick done: {result['text']}"
         return f"manager-tick failed: {result['text']}"
 
-    if run_id and contains_any(lowered, ["approve", "批准", "通过pr", "创建 pr", "open pr"]):
+    if run_id and "approve" in intents:
         return (
             "出于安全原因，PR 批准仍需显式命令："
             "/approve_pr <run_id> <confirm_token>"
@@ -1541,16 +2715,18 @@ def execute_nl_selection(
     if action == "resume_run":
         if not run_id:
             return "缺少 run_id。请在消息中包含 run_id。"
-        target = normalize_target_state(
-            selection.target_state or extract_target_state_from_text(text),
+        target = resolve_target_state(
+            text,
+            explicit=selection.target_state,
             default=DEFAULT_TARGET_STATE,
         )
         return dispatch_bot(f"/resume {run_id} {target}")
     if action == "retry_run":
         if not run_id:
             return "缺少 run_id。请在消息中包含 run_id。"
-        target = normalize_target_state(
-            selection.target_state or extract_target_state_from_text(text),
+        target = resolve_target_state(
+            text,
+            explicit=selection.target_state,
             default=DEFAULT_TARGET_STATE,
         )
         return dispatch_bot(f"/retry {run_id} {target}")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import io
 import json
 import os
 import re
@@ -19,26 +21,39 @@ from .models import RunState
 # Constants
 # ---------------------------------------------------------------------------
 
-READ_COMMANDS: set[str] = {
-    "/start",
-    "/help",
-    "/list",
-    "/overview",
-    "/show",
-    "/status",
-    "/pending_pr",
-}
-WRITE_COMMANDS: set[str] = {
-    "/create",
-    "/pause",
-    "/resume",
-    "/retry",
-}
-ADMIN_COMMANDS: set[str] = {
-    "/approve_pr",
-}
 NL_DISPATCH_COMMAND = "/nl"
-WRITE_COMMANDS.add(NL_DISPATCH_COMMAND)
+
+READ_COMMANDS: frozenset[str] = frozenset(
+    {
+        "/start",
+        "/help",
+        "/list",
+        "/overview",
+        "/show",
+        "/status",
+        "/pending_pr",
+    }
+)
+WRITE_COMMANDS: frozenset[str] = frozenset(
+    {
+        "/create",
+        "/pause",
+        "/resume",
+        "/retry",
+        NL_DISPATCH_COMMAND,
+    }
+)
+ADMIN_COMMANDS: frozenset[str] = frozenset(
+    {
+        "/approve_pr",
+    }
+)
+# Highest level wins when a command appears in more than one set.
+_ACCESS_LEVEL: dict[str, str] = (
+    {command: "read" for command in READ_COMMANDS}
+    | {command: "write" for command in WRITE_COMMANDS}
+    | {command: "admin" for command in ADMIN_COMMANDS}
+)
 
 RUN_ID_PATTERN = re.compile(r"\b(?:run|baseline|calib|rerun|smoke)_[A-Za-z0-9_.-]+\b")
 OWNER_REPO_PATTERN = re.compile(r"\b([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)\b")
@@ -46,6 +61,11 @@ GITHUB_REPO_URL_PATTERN = re.compile(
     r"(?:https?://)?(?:www\.)?github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)(?:\.git)?(?:/|$)",
     flags=re.IGNORECASE,
 )
+REPO_REF_SEPARATOR_PATTERN = re.compile(r"[\s,;]+")
+PROMPT_VERSION_PATTERN = re.compile(
+    r"(?:prompt[_\s-]*version|版本)\s*[:=]?\s*([A-Za-z0-9_.-]+)",
+    flags=re.IGNORECASE,
+)
 
 BOT_RULES_FOOTER = (
     "Rules:\n"
@@ -84,16 +104,22 @@ REASON_CODE_EXPLANATIONS: dict[str, str] = {
 NL_MODE_RULES = "rules"
 NL_MODE_LLM = "llm"
 NL_MODE_HYBRID = "hybrid"
-NL_MODES = {NL_MODE_RULES, NL_MODE_LLM, NL_MODE_HYBRID}
+NL_MODES = frozenset({NL_MODE_RULES, NL_MODE_LLM, NL_MODE_HYBRID})
+
+TELEGRAM_MODE_POLL = "poll"
+TELEGRAM_MODE_WEBHOOK = "webhook"
+TELEGRAM_MODES = frozenset({TELEGRAM_MODE_POLL, TELEGRAM_MODE_WEBHOOK})
 
 DECISION_WHY_MODE_OFF = "off"
 DECISION_WHY_MODE_HYBRID = "hybrid"
 DECISION_WHY_MODE_LLM = "llm"
-DECISION_WHY_MODES = {
-    DECISION_WHY_MODE_OFF,
-    DECISION_WHY_MODE_HYBRID,
-    DECISION_WHY_MODE_LLM,
-}
+DECISION_WHY_MODES = frozenset(
+    {
+        DECISION_WHY_MODE_OFF,
+        DECISION_WHY_MODE_HYBRID,
+        DECISION_WHY_MODE_LLM,
+    }
+)
 
 BOT_NL_ALLOWED_ACTIONS = [
     "help",
@@ -107,15 +133,68 @@ BOT_NL_ALLOWED_ACTIONS = [
     "retry_run",
     "manager_tick",
 ]
+# Membership checks; the list above keeps the order shown to the LLM.
+BOT_NL_ALLOWED_ACTION_SET = frozenset(BOT_NL_ALLOWED_ACTIONS)
+
+NOTIFY_TERMINAL_STATES = frozenset(
+    {
+        RunState.PUSHED.value,
+        RunState.NEEDS_HUMAN_REVIEW.value,
+        RunState.FAILED.value,
+        RunState.DONE.value,
+    }
+)
+# ITERATING is scanned too, but only notifies on CI/review events.
+NOTIFY_SCAN_STATES = frozenset(NOTIFY_TERMINAL_STATES | {RunState.ITERATING.value})
+
+DEFAULT_TARGET_STATE: str = RunState.EXECUTING.value
 
-NOTIFY_TERMINAL_STATES = {
-    RunState.PUSHED.value,
-    RunState.NEEDS_HUMAN_REVIEW.value,
-    RunState.FAILED.value,
-    RunState.DONE.value,
+# Keyword triggers for rule-based NL routing (lowercase), keyed by intent.
+NL_INTENT_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "help": ("help", "规则", "命令", "commands"),
+    "create": ("create", "new run", "创建", "新建", "跑这个repo", "跑这个仓库"),
+    "list": ("list", "all runs", "运行列表", "全部运行", "列出"),
+    "show": ("status", "show", "state", "状态", "进展", "情况"),
+    "overview": ("status", "overall", "overview", "目前", "整体", "全局", "近况", "情况"),
+    "pause": ("pause", "暂停"),
+    "resume": ("resume", "恢复", "继续"),
+    "retry": ("retry", "重试"),
+    "manager_tick": ("manager tick", "推进", "继续跑", "next step", "run tick"),
+    "approve": ("approve", "批准", "通过pr", "创建 pr", "open pr"),
 }
 
-DEFAULT_TARGET_STATE: str = RunState.EXECUTING.value
+
+def _build_nl_intent_matcher(
+    keywords_by_intent: dict[str, tuple[str, ...]],
+) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    intents_by_keyword: dict[str, set[str]] = {}
+    for intent, keywords in keywords_by_intent.items():
+        for keyword in keywords:
+            intents_by_keyword.setdefault(keyword, set()).add(intent)
+    # The alternation only reports the longest keyword at each position, so each
+    # keyword also carries the intents of every shorter keyword it starts with.
+    closed: dict[str, frozenset[str]] = {}
+    for keyword in intents_by_keyword:
+        fired: set[str] = set()
+        for other, intents in intents_by_keyword.items():
+            if keyword.startswith(other):
+                fired.update(intents)
+        closed[keyword] = frozenset(fired)
+    ordered = sorted(intents_by_keyword, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(item) for item in ordered) + "))")
+    return pattern, closed
+
+
+_NL_INTENT_PATTERN, _NL_INTENTS_BY_KEYWORD = _build_nl_intent_matcher(NL_INTENT_KEYWORDS)
+
+
+def match_nl_intents(lowered: str) -> frozenset[str]:
+    """Return every intent whose keywords occur in ``lowered``, in one regex pass."""
+    fired: set[str] = set()
+    for match in _NL_INTENT_PATTERN.finditer(lowered):
+        fired.update(_NL_INTENTS_BY_KEYWORD[match.group(1)])
+    return frozenset(fired)
+
 
 # ---------------------------------------------------------------------------
 # Config / env resolution
@@ -160,6 +239,13 @@ def resolve_telegram_nl_mode() -> str:
     return NL_MODE_RULES
 
 
+def resolve_telegram_mode() -> str:
+    raw = str(os.environ.get("AGENTPR_TELEGRAM_MODE") or TELEGRAM_MODE_POLL).strip().lower()
+    if raw in TELEGRAM_MODES:
+        return raw
+    return TELEGRAM_MODE_POLL
+
+
 def resolve_decision_why_mode() -> str:
     raw = str(
         os.environ.get("AGENTPR_TELEGRAM_DECISION_WHY_MODE")
@@ -228,9 +314,9 @@ def build_decision_llm_client_if_enabled(
 
 def resolve_notification_chat_ids(
     *,
-    allowed_chat_ids: set[int],
-    write_chat_ids: set[int],
-    admin_chat_ids: set[int],
+    allowed_chat_ids: set[int] | frozenset[int],
+    write_chat_ids: set[int] | frozenset[int],
+    admin_chat_ids: set[int] | frozenset[int],
 ) -> list[int]:
     if admin_chat_ids:
         return sorted(admin_chat_ids)
@@ -279,10 +365,16 @@ def extract_run_id_from_text(text: str) -> str | None:
 
 def extract_repo_refs_text(text: str) -> list[str]:
     raw_text = str(text)
+    # Every form parse_repo_ref accepts (owner/repo, URL, git@host:owner/repo)
+    # contains a slash, so most chat messages skip the split entirely.
+    if "/" not in raw_text:
+        return []
     found: list[str] = []
     seen: set[str] = set()
-    for token in re.split(r"[\s,;]+", raw_text):
-        normalized = str(token).strip().strip("()[]{}<>\"'`")
+    for token in REPO_REF_SEPARATOR_PATTERN.split(raw_text):
+        if "/" not in token:
+            continue
+        normalized = token.strip().strip("()[]{}<>\"'`")
         if not normalized:
             continue
         parsed = parse_repo_ref(normalized)
@@ -304,6 +396,7 @@ def extract_repo_ref_text(text: str) -> str | None:
     return refs[0]
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_repo_ref(value: str) -> tuple[str, str] | None:
     raw = str(value).strip()
     if not raw:
@@ -337,62 +430,121 @@ def parse_repo_ref(value: str) -> tuple[str, str] | None:
 
 def extract_prompt_version_from_text(text: str) -> str | None:
     value = str(text)
-    match = re.search(r"(?:prompt[_\s-]*version|版本)\s*[:=]?\s*([A-Za-z0-9_.-]+)", value, flags=re.IGNORECASE)
+    match = PROMPT_VERSION_PATTERN.search(value)
     if match is None:
         return None
     parsed = str(match.group(1)).strip()
     return parsed or None
 
 
-def extract_target_state_from_text(text: str) -> str | None:
-    raw = str(text).upper()
-    for state in RunState:
-        if state.value in raw:
-            return state.value
-    zh_map = {
-        "执行": RunState.EXECUTING.value,
-        "发现": RunState.DISCOVERY.value,
-        "计划": RunState.PLAN_READY.value,
-        "实现": RunState.IMPLEMENTING.value,
-        "本地验证": RunState.LOCAL_VALIDATING.value,
-        "推送": RunState.PUSHED.value,
-        "等待CI": RunState.CI_WAIT.value,
-        "等待REVIEW": RunState.REVIEW_WAIT.value,
-        "迭代": RunState.ITERATING.value,
-        "人工": RunState.NEEDS_HUMAN_REVIEW.value,
-        "失败": RunState.FAILED.value,
-        "重试失败": RunState.FAILED_RETRYABLE.value,
-        "完成": RunState.DONE.value,
-        "跳过": RunState.SKIPPED.value,
-        "终止": RunState.FAILED_TERMINAL.value,
+# Chinese (and mixed) target-state keywords, checked in order after exact state names.
+# Keys are matched against the lowercased text with spaces removed.
+_ZH_TARGET_STATE_KEYWORDS: tuple[tuple[str, str], ...] = tuple(
+    (key.lower(), state)
+    for key, state in (
+        ("执行", RunState.EXECUTING.value),
+        ("发现", RunState.DISCOVERY.value),
+        ("计划", RunState.PLAN_READY.value),
+        ("实现", RunState.IMPLEMENTING.value),
+        ("本地验证", RunState.LOCAL_VALIDATING.value),
+        ("推送", RunState.PUSHED.value),
+        ("等待CI", RunState.CI_WAIT.value),
+        ("等待REVIEW", RunState.REVIEW_WAIT.value),
+        ("迭代", RunState.ITERATING.value),
+        ("人工", RunState.NEEDS_HUMAN_REVIEW.value),
+        ("失败", RunState.FAILED.value),
+        ("重试失败", RunState.FAILED_RETRYABLE.value),
+        ("完成", RunState.DONE.value),
+        ("跳过", RunState.SKIPPED.value),
+        ("终止", RunState.FAILED_TERMINAL.value),
+    )
+)
+
+
+def _build_first_key_matcher(
+    keys: tuple[str, ...],
+) -> tuple[re.Pattern[str], dict[str, int]]:
+    """Compile ``keys`` into one overlapping scan that reports the earliest-listed hit.
+
+    Each matched key maps to the lowest index among the keys it starts with, since
+    the alternation only reports the longest key at a given position.
+    """
+    first_index = {key: index for index, key in reversed(list(enumerate(keys)))}
+    rank = {
+        key: min(index for other, index in first_index.items() if key.startswith(other))
+        for key in first_index
     }
+    ordered = sorted(first_index, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(key) for key in ordered) + "))")
+    return pattern, rank
+
+
+_STATE_NAME_KEYS: tuple[str, ...] = tuple(state.value for state in RunState)
+_STATE_NAME_PATTERN, _STATE_NAME_RANK = _build_first_key_matcher(_STATE_NAME_KEYS)
+_ZH_STATE_PATTERN, _ZH_STATE_RANK = _build_first_key_matcher(
+    tuple(key for key, _ in _ZH_TARGET_STATE_KEYWORDS)
+)
+
+
+def _first_listed_match(pattern: re.Pattern[str], rank: dict[str, int], text: str) -> int | None:
+    best: int | None = None
+    for match in pattern.finditer(text):
+        index = rank[match.group(1)]
+        if best is None or index < best:
+            best = index
+    return best
+
+
+def extract_target_state_from_text(text: str) -> str | None:
+    # Exact state names win over keywords; within each group the earliest-listed
+    # entry wins regardless of where it appears in the text.
+    index = _first_listed_match(_STATE_NAME_PATTERN, _STATE_NAME_RANK, str(text).upper())
+    if index is not None:
+        return _STATE_NAME_KEYS[index]
     lowered = str(text).replace(" ", "").lower()
-    for key, state in zh_map.items():
-        if key.lower() in lowered:
-            return state
+    index = _first_listed_match(_ZH_STATE_PATTERN, _ZH_STATE_RANK, lowered)
+    if index is not None:
+        return _ZH_TARGET_STATE_KEYWORDS[index][1]
     return None
 
 
+_RUN_STATE_VALUES = frozenset(state.value for state in RunState)
+
+
 def normalize_target_state(target_state: str | None, *, default: str) -> str:
     if isinstance(target_state, str):
         normalized = target_state.strip().upper()
-        if normalized in {state.value for state in RunState}:
+        if normalized in _RUN_STATE_VALUES:
             return normalized
     return default
 
 
+def resolve_target_state(text: str, *, explicit: str | None = None, default: str) -> str:
+    """Normalize ``explicit`` when given, otherwise the state named in ``text``.
+
+    The text is only scanned when no explicit state was supplied.
+    """
+    return normalize_target_state(
+        explicit or extract_target_state_from_text(text),
+        default=default,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Format / text utilities
 # ---------------------------------------------------------------------------
 
 
+_BOT_RESPONSE_SUFFIX = f"\n\n---\n{BOT_RULES_FOOTER}"
+
+
 def format_bot_response(message: str) -> str:
     body = str(message).strip() or "(empty response)"
-    return f"{body}\n\n---\n{BOT_RULES_FOOTER}"
+    return body + _BOT_RESPONSE_SUFFIX
 
 
 def truncate_text(value: str, max_len: int) -> str:
-    text = str(value)
+    text = value if isinstance(value, str) else str(value)
     if len(text) <= max_len:
         return text
     return text[: max_len - 3] + "..."
@@ -405,11 +557,6 @@ def clamp_str(value: str, *, max_len: int) -> str:
     return text[: max_len - 3] + "..."
 
 
-def contains_any(text: str, needles: list[str]) -> bool:
-    value = str(text).lower()
-    return any(item.lower() in value for item in needles if item)
-
-
 def try_parse_json(text: str) -> dict[str, Any] | None:
     try:
         parsed = json.loads(text)
@@ -425,50 +572,52 @@ def try_parse_json(text: str) -> dict[str, Any] | None:
 # ---------------------------------------------------------------------------
 
 
+# Characters that make shlex.split differ from str.split: quotes, escapes and
+# whitespace that shlex does not treat as a separator (e.g. U+3000, \x0b).
+_SHLEX_SENSITIVE_PATTERN = re.compile(r"[\"'\\]|[^\S \t\r\n]")
+
+
+def split_command_text(text: str) -> list[str]:
+    """Tokenize like ``shlex.split``; plain ``str.split`` when nothing needs lexing.
+
+    Raises ``ValueError`` on unbalanced quotes, like ``shlex.split``.
+    """
+    if _SHLEX_SENSITIVE_PATTERN.search(text) is None:
+        return text.split()
+    return shlex.split(text)
+
+
 def parse_command_name(text: str) -> str | None:
+    # Only the head token matters here; full lexing is left to the handler.
     if not text.startswith("/"):
         return None
-    try:
-        parts = shlex.split(text)
-    except ValueError:
-        return None
-    if not parts:
-        return None
-    return parts[0].split("@", 1)[0].lower()
+    head = text.split(None, 1)[0]
+    return head.split("@", 1)[0].lower()
 
 
 def command_access_level(command: str) -> str:
-    if command in ADMIN_COMMANDS:
-        return "admin"
-    if command in WRITE_COMMANDS:
-        return "write"
-    if command in READ_COMMANDS:
-        return "read"
-    return "unknown"
+    return _ACCESS_LEVEL.get(command, "unknown")
 
 
 def authorize_command(
     *,
     chat_id: int,
     command: str,
-    allow_chat: bool,
-    write_chat_ids: set[int],
-    admin_chat_ids: set[int],
+    write_chat_ids: set[int] | frozenset[int],
+    admin_chat_ids: set[int] | frozenset[int],
 ) -> tuple[bool, str | None]:
-    if not allow_chat:
-        return False, "chat_not_allowlisted"
+    # Chats outside the allowlist are dropped before authorization.
     level = command_access_level(command)
     if level == "read":
         return True, None
+    # Without any write/admin allowlist every allowlisted chat is trusted.
+    if not write_chat_ids and not admin_chat_ids:
+        return True, None
     if level == "write":
-        if allow_chat and not write_chat_ids and not admin_chat_ids:
-            return True, None
         if chat_id in admin_chat_ids or chat_id in write_chat_ids:
             return True, None
         return False, "write_permission_required"
     if level == "admin":
-        if allow_chat and not admin_chat_ids and not write_chat_ids:
-            return True, None
         if chat_id in admin_chat_ids:
             return True, None
         return False, "admin_permission_required"
@@ -480,42 +629,93 @@ def authorize_command(
 # ---------------------------------------------------------------------------
 
 
-def run_cli_command(
-    argv: list[str],
-    *,
+# CLI verbs that only touch the database; run them inside the bot process
+# instead of paying interpreter startup and imports for a subprocess.
+IN_PROCESS_CLI_COMMANDS: frozenset[str] = frozenset({"create-run", "pause", "resume", "retry"})
+
+
+def _run_cli_in_process(cli_args: list[str]) -> tuple[int, str, str]:
+    from . import cli  # cli imports telegram_bot; resolve lazily.
+
+    # Explicit streams, not redirect_stdout: other threads keep writing to the
+    # real process streams while the CLI runs.
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    try:
+        returncode = cli.main(cli_args, stdout=stdout, stderr=stderr)
+    except SystemExit as exc:
+        returncode = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+    except Exception as exc:  # noqa: BLE001
+        print(f"{type(exc).__name__}: {exc}", file=stderr)
+        returncode = 1
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+@functools.lru_cache(maxsize=8)
+def _cli_path_args(
     db_path: Path,
     workspace_root: Path,
     integration_root: Path,
-    project_root: Path,
-) -> dict[str, Any]:
-    cmd = [
-        sys.executable,
-        "-m",
-        "orchestrator.cli",
+) -> tuple[str, ...]:
+    return (
         "--db",
         str(db_path),
         "--workspace-root",
         str(workspace_root),
         "--integration-root",
         str(integration_root),
-        *argv,
-    ]
-    completed = subprocess.run(  # noqa: S603
-        cmd,
-        cwd=project_root,
-        text=True,
-        capture_output=True,
-        check=False,
     )
-    text = completed.stdout.strip() or completed.stderr.strip() or "(no output)"
+
+
+def run_cli_command(
+    argv: list[str],
+    *,
+    db_path: Path,
+    workspace_root: Path,
+    integration_root: Path,
+    project_root: Path,
+) -> dict[str, Any]:
+    if (
+        argv
+        and argv[0] in IN_PROCESS_CLI_COMMANDS
+        and not parse_bool_env("AGENTPR_TELEGRAM_CLI_SUBPROCESS", False)
+    ):
+        # Match the subprocess, which resolves relative paths against project_root.
+        returncode, stdout, stderr = _run_cli_in_process(
+            [
+                *_cli_path_args(
+                    project_root / db_path,
+                    project_root / workspace_root,
+                    project_root / integration_root,
+                ),
+                *argv,
+            ]
+        )
+    else:
+        cmd = [
+            sys.executable,
+            "-m",
+            "orchestrator.cli",
+            *_cli_path_args(db_path, workspace_root, integration_root),
+            *argv,
+        ]
+        completed = subprocess.run(  # noqa: S603
+            cmd,
+            cwd=project_root,
+            text=True,
+            capture_output=True,
+            check=False,
+        )
+        returncode, stdout, stderr = completed.returncode, completed.stdout, completed.stderr
+    text = stdout.strip() or stderr.strip() or "(no output)"
     payload = try_parse_json(text)
     if payload is not None:
         return {
-            "ok": completed.returncode == 0,
+            "ok": returncode == 0,
             "payload": payload,
             "text": json.dumps(payload, ensure_ascii=True),
         }
-    return {"ok": completed.returncode == 0, "payload": None, "text": text}
+    return {"ok": returncode == 0, "payload": None, "text": text}
 
 
 def run_and_render_action(
@@ -547,9 +747,10 @@ def build_audit_entry(
     outcome: str,
     detail: str,
     response: str,
+    ts: str | float | None = None,
 ) -> dict[str, Any]:
     return {
-        "ts": datetime.now(UTC).isoformat(),
+        "ts": ts if ts is not None else datetime.now(UTC).isoformat(),
         "update_id": int(update_id),
         "chat_id": int(chat_id),
         "command": command,